@@ -0,0 +1,128 @@
+"""CLI script for asking questions via RAG."""
+
+import argparse
+import hashlib
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from app.settings import settings
+
+# Answers from earlier runs (stored next to the Chroma data), so asking the
+# same question again skips embedding, search and the LLM call. Entries are
+# keyed on the vector store's document count, so any indexing invalidates them.
+ASK_CACHE_FILENAME = "ask_cache.sqlite3"
+
+# Yielded by AnswerGenerator.stream_answer when generation fails (possibly
+# mid-answer); such answers are never cached
+_ERROR_PREFIX = "Error generating answer:"
+
+
+def _cache_key(question: str, top_k: int, index_version: int) -> bytes:
+    """Hash a question with everything else that shapes its answer, ignoring whitespace-only differences."""
+    parts = (
+        " ".join(question.split()),
+        str(top_k),
+        str(index_version),
+        settings.llm_model,
+        settings.embedding_model,
+        str(settings.embedding_dimensions or 0),
+    )
+    return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+def _open_cache() -> sqlite3.Connection | None:
+    """Open the answer cache (None if it can't be opened)."""
+    path = Path(settings.chroma_persist_directory) / ASK_CACHE_FILENAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key BLOB PRIMARY KEY, answer TEXT NOT NULL, created_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        return conn
+    except (OSError, sqlite3.Error) as e:
+        print(f"Could not open answer cache {path}: {e}")
+        return None
+
+
+def _load_cached_answer(conn: sqlite3.Connection, key: bytes, ttl: float) -> str | None:
+    """Look up an answer saved less than ttl seconds ago."""
+    row = conn.execute(
+        "SELECT answer FROM answers WHERE key = ? AND created_at > ?",
+        (key, time.time() - ttl),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _save_cached_answer(conn: sqlite3.Connection, key: bytes, answer: str) -> None:
+    """Save an answer for later runs."""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO answers VALUES (?, ?, ?)", (key, answer, time.time())
+        )
+
+
+def main():
+    """Main CLI question script."""
+    parser = argparse.ArgumentParser(description="Ask questions via RAG")
+    parser.add_argument("--q", "--question", type=str, required=True, help="Question to ask")
+    parser.add_argument("--top-k", type=int, default=5, help="Number of context documents to retrieve")
+    parser.add_argument("--debug", action="store_true", help="Enable debug output (shows similarity scores)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always ask fresh and don't save the answer (e.g. for evaluation runs)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=86400,
+        help="Seconds a cached answer is reused (default: 86400)",
+    )
+
+    args = parser.parse_args()
+
+    print(f"Question: {args.q}\n")
+
+    # Imported after argument parsing: this pulls in the OpenAI and Chroma
+    # clients, which --help and argument errors don't need
+    from app.rag.answer import LOW_CONFIDENCE_MESSAGE, NO_RESULTS_MESSAGE, ask_stream
+    from app.rag.store import get_store
+
+    # --debug always asks fresh so the retrieval scores are printed
+    conn = None if args.no_cache or args.debug else _open_cache()
+    if conn is not None:
+        # Any indexing since the answer was saved changes the key
+        key = _cache_key(args.q, args.top_k, get_store().count())
+        answer = _load_cached_answer(conn, key, args.cache_ttl)
+        if answer is not None:
+            print(answer)
+            return
+
+    # Ask question, printing the answer as it is generated
+    pieces = []
+    for piece in ask_stream(args.q, top_k=args.top_k, debug=args.debug):
+        if not pieces and args.debug:
+            sys.stdout.write("\n")  # Separate the answer from the debug output
+        sys.stdout.write(piece)
+        sys.stdout.flush()
+        pieces.append(piece)
+    sys.stdout.write("\n")
+    answer = "".join(pieces)
+
+    # Failed generations and "couldn't find" fallbacks are not cached, so a
+    # later run can answer once the problem is fixed or more is indexed
+    if (
+        conn is not None
+        and pieces
+        and not pieces[-1].startswith(_ERROR_PREFIX)
+        and not answer.startswith((NO_RESULTS_MESSAGE, LOW_CONFIDENCE_MESSAGE))
+    ):
+        _save_cached_answer(conn, key, answer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Bulk ingestion script for ALL public Slack channels."""
+
+import argparse
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from slack_sdk import WebClient
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+from app.ingestion.channels import CHANNEL_CACHE_TTL, list_public_channels
+from app.ingestion.slack_fetch import (
+    iter_channel_message_pages,
+    load_ingest_watermarks,
+    save_ingest_watermarks,
+)
+from app.utils.slack_client import get_slack_client
+
+
+def _fetch_one(
+    client: WebClient,
+    channel: dict,
+    limit: int,
+    pages: queue.Queue,
+    oldest: str | None = None,
+) -> None:
+    """
+    Fetch one channel's messages, passing each page on as soon as it arrives.
+
+    Puts ("page", channel name, documents) for every page, then
+    ("done", channel name, error message or None) when the channel is finished.
+    A channel cut short by an error may already have put some pages.
+
+    Args:
+        client: Slack WebClient instance
+        channel: Channel dict from list_public_channels
+        limit: Maximum messages to fetch
+        pages: Queue the pages are put on
+        oldest: Only fetch messages newer than this ts
+    """
+    try:
+        for page in iter_channel_message_pages(client, channel["id"], limit=limit, oldest=oldest):
+            pages.put(("page", channel["name"], page))
+        pages.put(("done", channel["name"], None))
+    except Exception as e:
+        pages.put(("done", channel["name"], str(e)))
+
+
+def _flush(
+    messages: list[dict], channel_names: list[str], chunk_size: int, overlap: int
+) -> tuple[int, str | None]:
+    """
+    Index messages accumulated from one or more channels in a single pass.
+
+    Args:
+        messages: Message documents to index
+        channel_names: Channels the messages came from (for output)
+        chunk_size: Text chunk size
+        overlap: Chunk overlap
+
+    Returns:
+        (chunks created, error message or None)
+    """
+    # Imported on first use: this pulls in the OpenAI and Chroma clients,
+    # which --help and --dry-run runs never need
+    from app.ingestion.realtime import index_documents
+
+    print(f"  Indexing {len(messages)} messages from {len(channel_names)} channel(s)...")
+    try:
+        num_chunks = index_documents(messages, chunk_size=chunk_size, overlap=overlap)
+        print(f"  ✅ Indexed {num_chunks} chunks from {', '.join('#' + name for name in channel_names)}\n")
+        return num_chunks, None
+    except Exception as e:
+        print(f"  ❌ Failed to index {', '.join('#' + name for name in channel_names)}: {e}\n")
+        return 0, str(e)
+
+
+def main():
+    """Main ingestion script for all channels."""
+    parser = argparse.ArgumentParser(
+        description="Index ALL public Slack channels into vector store"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=1000,
+        help="Maximum messages per channel (default: 1000)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=600,
+        help="Text chunk size (default: 600)",
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=100,
+        help="Chunk overlap (default: 100)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Channels ingested in parallel (default: 4)",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=2000,
+        help="Messages pooled across channels before indexing them together (default: 2000)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Refetch full history instead of only messages newer than the last run",
+    )
+    parser.add_argument(
+        "--channel-cache-ttl",
+        type=float,
+        default=CHANNEL_CACHE_TTL,
+        help=f"Seconds a cached channel list is reused before refetching (default: {CHANNEL_CACHE_TTL:g})",
+    )
+    parser.add_argument(
+        "--refresh-channels",
+        action="store_true",
+        help="Refetch the channel list even if the cached one is fresh",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print a line for every channel fetched (default: periodic progress only)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List channels without indexing",
+    )
+    parser.add_argument(
+        "--only-joined",
+        action="store_true",
+        help="Only index channels the bot has joined (default: all public channels)",
+    )
+
+    args = parser.parse_args()
+
+    # Initialize Slack client
+    print("Initializing Slack client...")
+    # Process-wide client, shared by every worker thread (WebClient is thread-safe)
+    client = get_slack_client()
+    # Back off and retry on HTTP 429 (only the rate-limited worker waits)
+    client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=5))
+
+    # Get all public channels (from the local cache if it is fresh enough)
+    print("Fetching public channels (reusing a recent list; --refresh-channels to refetch)...")
+    channels = list_public_channels(
+        client,
+        only_joined=args.only_joined,
+        use_cache=not args.refresh_channels,
+        cache_ttl=args.channel_cache_ttl,
+    )
+
+    if not channels:
+        print("No channels found.")
+        return
+
+    if args.only_joined:
+        print(f"\nFound {len(channels)} channels the bot is a member of:")
+    else:
+        print(f"\nFound {len(channels)} public channels:")
+
+    for ch in channels:
+        member_status = "✓ joined" if ch["is_member"] else "not joined"
+        print(f"  - #{ch['name']} ({ch['id']}) - {ch['num_members']} members [{member_status}]")
+
+    if args.dry_run:
+        print("\n[Dry run] No indexing performed.")
+        return
+
+    print(f"\n{'='*60}")
+    print(f"Starting indexing (max {args.limit} messages per channel, {args.workers} channels at a time)...")
+    print(f"{'='*60}\n")
+
+    total_messages = 0
+    total_chunks = 0
+    failed_channels = []
+
+    # Channels are fetched in parallel (WebClient is thread-safe; rate-limited
+    # requests are retried per worker) and their pages streamed to this thread
+    # as they arrive. Pages are pooled and indexed together every --flush-every
+    # messages, so embedding requests and Chroma writes are full-sized batches
+    # and indexing overlaps with fetching.
+    pending_messages: list[dict] = []
+    pending_channels: dict[str, None] = {}  # Insertion-ordered set
+    fetched_counts: dict[str, int] = {}
+
+    # Reruns only fetch messages newer than what earlier runs ingested
+    watermarks = load_ingest_watermarks()
+    newest_ts: dict[str, str] = {}
+    complete_channels: list[dict] = []
+    truncated_channels: list[str] = []
+
+    def flush() -> None:
+        nonlocal total_messages, total_chunks
+        num_chunks, error = _flush(
+            pending_messages, list(pending_channels), args.chunk_size, args.chunk_overlap
+        )
+        if error:
+            failed_channels.extend(
+                name for name in pending_channels if name not in failed_channels
+            )
+        else:
+            total_messages += len(pending_messages)
+            total_chunks += num_chunks
+        pending_messages.clear()
+        pending_channels.clear()
+
+    # Bounded so fetchers can't run arbitrarily far ahead of indexing
+    pages: queue.Queue = queue.Queue(maxsize=4 * args.workers)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for channel in channels:
+            executor.submit(
+                _fetch_one,
+                client,
+                channel,
+                args.limit,
+                pages,
+                None if args.full else watermarks.get(channel["id"]),
+            )
+        channels_by_name = {channel["name"]: channel for channel in channels}
+
+        # Without --verbose, report progress about every 10% instead of per channel
+        progress_every = max(1, len(channels) // 10)
+
+        finished = 0
+        while finished < len(channels):
+            kind, channel_name, payload = pages.get()
+
+            if kind == "page":
+                fetched_counts[channel_name] = fetched_counts.get(channel_name, 0) + len(payload)
+                channel_id = channels_by_name[channel_name]["id"]
+                page_newest = max((msg["ts"] for msg in payload), key=float, default=None)
+                if page_newest and (
+                    channel_id not in newest_ts or float(page_newest) > float(newest_ts[channel_id])
+                ):
+                    newest_ts[channel_id] = page_newest
+                pending_messages.extend(payload)
+                pending_channels[channel_name] = None
+                if len(pending_messages) >= args.flush_every:
+                    flush()
+                continue
+
+            finished += 1
+            num_fetched = fetched_counts.get(channel_name, 0)
+            if payload:
+                print(f"[{finished}/{len(channels)}] ❌ Failed to fetch #{channel_name}: {payload}")
+                failed_channels.append(channel_name)
+            else:
+                # Fewer than --limit messages means pagination reached the
+                # watermark (or the start of the channel); otherwise older
+                # messages may have been left unfetched
+                if num_fetched < args.limit:
+                    complete_channels.append(channels_by_name[channel_name])
+                else:
+                    truncated_channels.append(channel_name)
+                if args.verbose:
+                    if num_fetched:
+                        print(f"[{finished}/{len(channels)}] Fetched {num_fetched} messages from #{channel_name}")
+                    else:
+                        print(f"[{finished}/{len(channels)}] No new messages in #{channel_name}, skipping.")
+                elif finished % progress_every == 0 or finished == len(channels):
+                    print(f"[{finished}/{len(channels)}] channels fetched")
+
+    if pending_messages:
+        flush()
+
+    # Advance watermarks only for channels that were fully fetched and indexed,
+    # so no message older than a watermark is ever left unfetched
+    for channel in complete_channels:
+        if channel["name"] not in failed_channels and channel["id"] in newest_ts:
+            watermarks[channel["id"]] = newest_ts[channel["id"]]
+    save_ingest_watermarks(watermarks)
+
+    # Summary
+    print(f"\n{'='*60}")
+    print("INDEXING COMPLETE")
+    print(f"{'='*60}")
+    print(f"Channels processed: {len(channels)}")
+    print(f"Total messages indexed: {total_messages}")
+    print(f"Total chunks created: {total_chunks}")
+
+    if failed_channels:
+        print(f"Failed channels: {', '.join(failed_channels)}")
+
+    if truncated_channels:
+        print(
+            f"Reached --limit in {len(truncated_channels)} channel(s), so their older messages "
+            f"may be unfetched and their watermarks were not advanced (rerun with a higher --limit): "
+            f"{', '.join(truncated_channels)}"
+        )
+
+    # Show total count in vector store (reusing the store indexing opened)
+    from app.rag.store import get_store
+    print(f"\nTotal documents in vector store: {get_store().count()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Bulk ingestion script for Slack messages."""
+
+import argparse
+
+from slack_sdk.errors import SlackApiError
+
+from app.ingestion.slack_fetch import (
+    get_channel_id,
+    iter_channel_message_pages,
+    load_ingest_watermarks,
+    save_ingest_watermarks,
+)
+from app.utils.slack_client import get_slack_client
+
+
+def main():
+    """Main ingestion script."""
+    parser = argparse.ArgumentParser(description="Index Slack messages into vector store")
+    parser.add_argument(
+        "--channel",
+        type=str,
+        required=True,
+        help="Channel name (e.g., '#all-slack-rag-test' or 'general')",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=2000, help="Maximum number of messages to fetch"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=600, help="Text chunk size (400-800 recommended)"
+    )
+    parser.add_argument(
+        "--chunk-overlap", type=int, default=100, help="Chunk overlap (80-120 recommended)"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Refetch full history instead of only messages newer than the last run",
+    )
+
+    args = parser.parse_args()
+
+    # Imported after argument parsing: this pulls in the OpenAI and Chroma
+    # clients, which --help and argument errors don't need
+    from app.ingestion.realtime import index_document_pages
+
+    # Initialize Slack client
+    print("Initializing Slack client...")
+    # Process-wide client (thread-safe, shared with the fetch helpers' worker threads)
+    client = get_slack_client()
+
+    # Get channel ID
+    print(f"Looking up channel: {args.channel}")
+    channel_id = get_channel_id(client, args.channel)
+
+    if not channel_id:
+        print(f"Error: Channel '{args.channel}' not found")
+        return
+
+    print(f"Found channel ID: {channel_id}")
+
+    # Reruns only fetch messages newer than what earlier runs ingested
+    watermarks = load_ingest_watermarks()
+    oldest = None if args.full else watermarks.get(channel_id)
+    newest_ts = None
+
+    def pages():
+        nonlocal newest_ts
+        for page in iter_channel_message_pages(client, channel_id, limit=args.limit, oldest=oldest):
+            page_newest = max((msg["ts"] for msg in page), key=float)
+            if newest_ts is None or float(page_newest) > float(newest_ts):
+                newest_ts = page_newest
+            yield page
+
+    # Fetch and index page by page: each page is chunked, embedded and stored
+    # while the next one is being fetched
+    if oldest:
+        print(f"Fetching and indexing up to {args.limit} messages newer than the last run...")
+    else:
+        print(f"Fetching and indexing up to {args.limit} messages...")
+    try:
+        num_messages, num_chunks = index_document_pages(
+            pages(),
+            chunk_size=args.chunk_size,
+            overlap=args.chunk_overlap,
+            on_page=lambda page_number, indexed: print(f"  Indexed {indexed} messages..."),
+        )
+    except SlackApiError as e:
+        # Pages fetched before the error are indexed, but the watermark stays
+        # put so the next run fetches the rest
+        print(f"Error fetching messages: {e}")
+        return
+
+    if not num_messages:
+        print("No new messages fetched. Exiting." if oldest else "No messages fetched. Exiting.")
+        return
+
+    # Fewer than --limit messages means pagination reached the watermark (or
+    # the start of the channel); otherwise older messages may be unfetched
+    if num_messages < args.limit:
+        watermarks[channel_id] = newest_ts
+        save_ingest_watermarks(watermarks)
+    else:
+        print(
+            f"Reached --limit ({args.limit}), so older messages may be unfetched; "
+            "the watermark was not advanced (rerun with a higher --limit)"
+        )
+
+    if not num_chunks:
+        print("No chunks created. Exiting.")
+        return
+
+    print(f"\n✅ Successfully indexed {num_chunks} chunks from {num_messages} messages")
+
+    # Show total count (reusing the store indexing opened)
+    from app.rag.store import get_store
+    print(f"Total documents in vector store: {get_store().count()}")
+
+
+if __name__ == "__main__":
+    main()
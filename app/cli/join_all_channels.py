@@ -0,0 +1,112 @@
+"""Script to make the bot join all public channels."""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+
+from app.ingestion.channels import clear_channel_cache, list_public_channels
+from app.utils.slack_client import get_slack_client
+
+
+def join_channel(client: WebClient, channel_id: str, channel_name: str) -> bool:
+    """Join a channel. Returns True if successful."""
+    try:
+        client.conversations_join(channel=channel_id)
+        return True
+    except SlackApiError as e:
+        print(f"  ❌ Failed to join #{channel_name}: {e.response['error']}")
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Make the bot join all public channels"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Channels joined in parallel (default: 8)",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print a line for every channel joined (default: periodic progress only)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List channels without joining",
+    )
+
+    args = parser.parse_args()
+
+    print("Initializing Slack client...")
+    # Process-wide client, shared by every worker thread (WebClient is thread-safe)
+    client = get_slack_client()
+    # Back off and retry on HTTP 429 (only the rate-limited worker waits)
+    client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=5))
+
+    print("Fetching all public channels...")
+    # Always list fresh: membership is what decides which channels to join
+    channels = list_public_channels(client, use_cache=False)
+
+    if not channels:
+        print("No channels found.")
+        return
+
+    # Separate joined and not-joined
+    joined = [ch for ch in channels if ch["is_member"]]
+    not_joined = [ch for ch in channels if not ch["is_member"]]
+
+    print(f"\nFound {len(channels)} public channels:")
+    print(f"  - Already joined: {len(joined)}")
+    print(f"  - Not joined: {len(not_joined)}")
+
+    if not not_joined:
+        print("\n✅ Bot is already a member of all public channels!")
+        return
+
+    print(f"\nChannels to join:")
+    for ch in not_joined:
+        print(f"  - #{ch['name']}")
+
+    if args.dry_run:
+        print("\n[Dry run] No channels joined.")
+        return
+
+    print(f"\nJoining {len(not_joined)} channels ({args.workers} at a time)...")
+    success_count = 0
+
+    # Joins are independent round-trips, so run several at once
+    # (WebClient is thread-safe; rate-limited requests are retried per worker)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(join_channel, client, ch["id"], ch["name"]): ch
+            for ch in not_joined
+        }
+
+        # Failures are printed by join_channel; successes only with --verbose,
+        # otherwise progress is reported about every 10%
+        progress_every = max(1, len(not_joined) // 10)
+        for done, future in enumerate(as_completed(futures), 1):
+            if future.result():
+                success_count += 1
+                if args.verbose:
+                    print(f"  ✅ Joined #{futures[future]['name']}")
+            if not args.verbose and (done % progress_every == 0 or done == len(not_joined)):
+                print(f"  [{done}/{len(not_joined)}] processed")
+
+    # The cached channel list (used by ingest-all-channels) has stale memberships now
+    if success_count:
+        clear_channel_cache()
+
+    print(f"\n{'='*40}")
+    print(f"Successfully joined {success_count}/{len(not_joined)} channels")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""List Slack channels, with an optional on-disk cache of the public channel list."""
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Public channel list from the last full listing (stored next to the Chroma data)
+CHANNEL_CACHE_FILENAME = "channels_cache.json"
+
+# Seconds a cached channel list is reused before listing again
+CHANNEL_CACHE_TTL = 3600.0
+
+
+def _fetch_channels(client: WebClient, types: str) -> tuple[list[dict], bool]:
+    """
+    List non-archived channels of the given types, following pagination.
+
+    Args:
+        client: Slack WebClient instance
+        types: Comma-separated conversation types (e.g. "public_channel")
+
+    Returns:
+        (channel dicts, whether every page was fetched)
+    """
+    channels = []
+    cursor = None
+
+    try:
+        while True:
+            response = client.conversations_list(
+                types=types,
+                exclude_archived=True,
+                limit=1000,  # Slack's maximum page size - fewer sequential round-trips
+                cursor=cursor,
+            )
+
+            for channel in response["channels"]:
+                channels.append({
+                    "id": channel["id"],
+                    "name": channel["name"],
+                    "num_members": channel.get("num_members", 0),
+                    "is_member": channel.get("is_member", False),
+                })
+
+            # Check for more pages
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+
+    except SlackApiError as e:
+        logger.error("Error fetching channels: %s", e)
+        return channels, False
+
+    return channels, True
+
+
+def list_channels(
+    client: WebClient, types: str = "public_channel", only_joined: bool = False
+) -> list[dict]:
+    """
+    List channels straight from Slack (never cached).
+
+    Args:
+        client: Slack WebClient instance
+        types: Comma-separated conversation types (e.g. "public_channel,private_channel")
+        only_joined: If True, only return channels the bot is a member of
+
+    Returns:
+        List of channel dicts with 'id', 'name', 'num_members' and 'is_member'
+        keys (channels listed before an API error, if one occurs)
+    """
+    channels, _ = _fetch_channels(client, types)
+    if only_joined:
+        channels = [ch for ch in channels if ch["is_member"]]
+    return channels
+
+
+def _channel_cache_path() -> Path:
+    """Path of the cached public channel list."""
+    return Path(settings.chroma_persist_directory) / CHANNEL_CACHE_FILENAME
+
+
+def _load_cached_channels(ttl: float) -> list[dict] | None:
+    """
+    Load the public channel list saved by an earlier listing.
+
+    Args:
+        ttl: Maximum age of the cached list in seconds
+
+    Returns:
+        Channel dicts, or None if there is no cached list or it is older than ttl
+    """
+    path = _channel_cache_path()
+    try:
+        if time.time() - path.stat().st_mtime >= ttl:
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read cached channel list: %s", e)
+        return None
+
+
+def _save_cached_channels(channels: list[dict]) -> None:
+    """Save the full public channel list for later listings."""
+    path = _channel_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(channels, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:
+        logger.warning("Could not save channel list: %s", e)
+
+
+def clear_channel_cache() -> None:
+    """Remove the cached public channel list (e.g. after channel memberships change)."""
+    _channel_cache_path().unlink(missing_ok=True)
+
+
+def list_public_channels(
+    client: WebClient,
+    only_joined: bool = False,
+    use_cache: bool = True,
+    cache_ttl: float = CHANNEL_CACHE_TTL,
+) -> list[dict]:
+    """
+    List all public channels, reusing a recent listing if there is one.
+
+    A complete listing is always saved, so later calls (including other
+    processes) can reuse it for up to cache_ttl seconds.
+
+    Args:
+        client: Slack WebClient instance
+        only_joined: If True, only return channels the bot is a member of.
+                     If False, return ALL public channels (requires channels:read scope)
+        use_cache: If False, always list the channels from Slack
+        cache_ttl: Maximum age in seconds of a cached listing to reuse
+
+    Returns:
+        List of channel dicts (see list_channels)
+    """
+    channels = _load_cached_channels(cache_ttl) if use_cache else None
+    if channels is None:
+        channels, complete = _fetch_channels(client, "public_channel")
+        # A partial listing (API error part-way) is returned but not cached
+        if complete and channels:
+            _save_cached_channels(channels)
+    else:
+        logger.info("Using cached channel list (%s)", CHANNEL_CACHE_FILENAME)
+
+    if only_joined:
+        channels = [ch for ch in channels if ch["is_member"]]
+    return channels
@@ -1,7 +1,17 @@
 """Text chunking utilities for splitting Slack messages."""
 
+import bisect
+import hashlib
+import itertools
+import os
 import re
-from typing import Any
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Any, TypedDict
 
 import tiktoken
 
@@ -14,11 +24,12 @@ URL_PATTERN = re.compile(
 CODE_BLOCK_PATTERN = re.compile(r'```[\s\S]*?```')  # Fenced code blocks
 INLINE_CODE_PATTERN = re.compile(r'`[^`\n]+`')  # Inline code
 # List items - supports English and Japanese markers
+# Indentation excludes newlines; spanning blank lines backtracked quadratically
 LIST_ITEM_PATTERN = re.compile(
-    r'^[\s]*[-*•・‣⁃]\s*.+$|'  # Bullet markers (English + Japanese ・)
-    r'^[\s]*[①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳]\s*.+$|'  # Circled numbers
-    r'^[\s]*[０-９]+[.．、]\s*.+$|'  # Full-width numbered lists (１. ２．)
-    r'^[\s]*[0-9]+[.．、]\s*.+$',  # Half-width numbered lists (1. 2、)
+    r'^[^\S\n]*[-*•・‣⁃]\s*.+$|'  # Bullet markers (English + Japanese ・)
+    r'^[^\S\n]*[①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳]\s*.+$|'  # Circled numbers
+    r'^[^\S\n]*[０-９]+[.．、]\s*.+$|'  # Full-width numbered lists (１. ２．)
+    r'^[^\S\n]*[0-9]+[.．、]\s*.+$',  # Half-width numbered lists (1. 2、)
     re.MULTILINE
 )
 
@@ -26,20 +37,104 @@ LIST_ITEM_PATTERN = re.compile(
 JAPANESE_SENTENCE_END = '。！？'  # Period, exclamation, question (full-width)
 JAPANESE_CLAUSE_BREAK = '、'  # Comma (読点)
 
-
-def _get_tokenizer():
-    """Get tiktoken tokenizer for consistent token counting."""
+# Break point candidates, one pattern per priority (see _find_break_point).
+# Every pattern starts with a literal character so re can skip ahead to it
+# with a fast character search; lookbehinds are only checked at those hits.
+_SENTENCE_END_CHAR = f'[.!?{JAPANESE_SENTENCE_END}]'
+PARAGRAPH_BREAK_PATTERN = re.compile(r'\n(?=\n)')  # Blank line (break at match start)
+SENTENCE_BREAK_PATTERN = re.compile(r'[.!?](?: |\n(?!\n))')  # English sentence end + space/newline
+JAPANESE_SENTENCE_BREAK_PATTERN = re.compile(rf'[{JAPANESE_SENTENCE_END}](?!\n\n)')  # 。！？ (break at match end)
+NEWLINE_BREAK_PATTERN = re.compile(rf'\n(?<!{_SENTENCE_END_CHAR}\n)(?!\n)')  # Plain newline
+SPACE_BREAK_PATTERN = re.compile(rf' (?<!{_SENTENCE_END_CHAR} )')  # Word boundary
+CLAUSE_BREAK_PATTERN = re.compile(rf'{JAPANESE_CLAUSE_BREAK}(?![ \n])')  # 、 (break at match end)
+
+# Token counts keyed by (encoding name, content hash) - reposted snippets skip re-encoding
+_TOKEN_CACHE_MAX_SIZE = 10_000
+_token_count_cache: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+_token_count_cache_lock = threading.Lock()
+
+# chunk_text results keyed by (content hash, chunking args) - re-indexed messages skip re-chunking
+_CHUNK_CACHE_MAX_SIZE = 2048
+_chunk_cache: OrderedDict[tuple, tuple[str, ...]] = OrderedDict()
+_chunk_cache_lock = threading.Lock()
+
+# chunk_documents fans out to a thread pool for batches at least this large
+PARALLEL_CHUNK_MIN_DOCS = 64
+
+# Chunks planned and token-validated together by _iter_raw_chunks
+CHUNK_VALIDATION_WINDOW = 64
+
+
+@lru_cache(maxsize=2)
+def _get_tokenizer(model: str = "gpt-4"):
+    """Get tiktoken tokenizer for consistent token counting (built once per process)."""
     try:
-        return tiktoken.encoding_for_model("gpt-4")
+        return tiktoken.encoding_for_model(model)
     except Exception:
         return tiktoken.get_encoding("cl100k_base")
 
 
 def _count_tokens(text: str, tokenizer=None) -> int:
-    """Count tokens in text using tiktoken."""
+    """Count tokens in text using tiktoken (cached by content hash)."""
+    return _count_tokens_batch([text], tokenizer)[0]
+
+
+def _count_tokens_batch(texts: list[str], tokenizer=None) -> list[int]:
+    """
+    Count tokens for many texts, encoding only cache misses in one batched call.
+
+    Args:
+        texts: Texts to count
+        tokenizer: Optional pre-loaded tiktoken encoder
+
+    Returns:
+        Token counts in the same order as texts
+    """
     if tokenizer is None:
         tokenizer = _get_tokenizer()
-    return len(tokenizer.encode(text))
+
+    counts: list[int | None] = [None] * len(texts)
+    miss_keys = []
+    miss_indices = []
+
+    keys = [
+        (tokenizer.name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest())
+        for text in texts
+    ]
+
+    with _token_count_cache_lock:
+        for i, key in enumerate(keys):
+            cached = _token_count_cache.get(key)
+            if cached is not None:
+                _token_count_cache.move_to_end(key)
+                counts[i] = cached
+            else:
+                miss_keys.append(key)
+                miss_indices.append(i)
+
+    if miss_indices:
+        # Encode outside the lock - tiktoken releases the GIL while encoding
+        token_lists = tokenizer.encode_ordinary_batch([texts[i] for i in miss_indices])
+        with _token_count_cache_lock:
+            for key, i, tokens in zip(miss_keys, miss_indices, token_lists):
+                counts[i] = len(tokens)
+                _token_count_cache[key] = len(tokens)
+            while len(_token_count_cache) > _TOKEN_CACHE_MAX_SIZE:
+                _token_count_cache.popitem(last=False)
+
+    return counts
+
+
+def clear_token_cache() -> None:
+    """Clear the token count cache."""
+    with _token_count_cache_lock:
+        _token_count_cache.clear()
+
+
+def clear_chunk_cache() -> None:
+    """Clear the chunk_text result cache."""
+    with _chunk_cache_lock:
+        _chunk_cache.clear()
 
 
 def _find_protected_ranges(text: str) -> list[tuple[int, int]]:
@@ -51,17 +146,24 @@ def _find_protected_ranges(text: str) -> list[tuple[int, int]]:
     """
     protected = []
 
+    # Cheap substring checks skip regex passes that cannot match
+    # (most Slack messages have no code or links)
+    has_backticks = '`' in text
+
     # Find code blocks first (highest priority - they may contain URLs)
-    for match in CODE_BLOCK_PATTERN.finditer(text):
-        protected.append((match.start(), match.end()))
+    if has_backticks and '```' in text:
+        for match in CODE_BLOCK_PATTERN.finditer(text):
+            protected.append((match.start(), match.end()))
 
     # Find inline code
-    for match in INLINE_CODE_PATTERN.finditer(text):
-        protected.append((match.start(), match.end()))
+    if has_backticks:
+        for match in INLINE_CODE_PATTERN.finditer(text):
+            protected.append((match.start(), match.end()))
 
     # Find URLs
-    for match in URL_PATTERN.finditer(text):
-        protected.append((match.start(), match.end()))
+    if '://' in text:
+        for match in URL_PATTERN.finditer(text):
+            protected.append((match.start(), match.end()))
 
     # Find list items
     for match in LIST_ITEM_PATTERN.finditer(text):
@@ -85,13 +187,86 @@ def _find_protected_ranges(text: str) -> list[tuple[int, int]]:
     return merged
 
 
-def _get_protected_range_at(position: int, protected_ranges: list[tuple[int, int]]) -> tuple[int, int] | None:
-    """Get the protected range that contains the given position, if any."""
-    for start, end in protected_ranges:
-        if start <= position < end:
-            return (start, end)
-        if start > position:
-            break
+def _get_protected_range_at(
+    position: int, starts: list[int], ends: list[int]
+) -> tuple[int, int] | None:
+    """
+    Get the protected range that contains the given position, if any.
+
+    Args:
+        position: Character position to check
+        starts: Sorted start positions of the merged protected ranges
+        ends: End positions parallel to starts
+
+    Returns:
+        (start, end) of the containing range or None
+    """
+    i = bisect.bisect_right(starts, position) - 1
+    if i >= 0 and ends[i] > position:
+        return (starts[i], ends[i])
+    return None
+
+
+@dataclass
+class _BreakIndex:
+    """Sorted candidate break positions for a text, grouped by priority tier."""
+
+    # (scan positions, break positions) per tier, best tier first
+    tiers: list[tuple[list[int], list[int]]]
+    # All space positions, for the word-boundary fallback
+    spaces: list[int]
+
+
+def _build_break_index(text: str) -> _BreakIndex:
+    """
+    Locate every candidate break position in one set of C-level regex scans.
+
+    Each position gets the priority the backward scan in _find_break_point
+    would assign it (paragraph/sentence > newline > space > Japanese clause).
+    """
+    # Priority 1/2: paragraph boundaries and sentence ends share a tier -
+    # the closest one to the chunk end wins
+    sentence_tier = sorted(
+        [(m.start(), m.start() + 2) for m in PARAGRAPH_BREAK_PATTERN.finditer(text)]
+        + [(m.start() + 1, m.start() + 2) for m in SENTENCE_BREAK_PATTERN.finditer(text)]
+        + [(m.end(), m.end()) for m in JAPANESE_SENTENCE_BREAK_PATTERN.finditer(text)]
+    )
+    newlines = [m.start() for m in NEWLINE_BREAK_PATTERN.finditer(text)]
+    word_breaks = [m.start() for m in SPACE_BREAK_PATTERN.finditer(text)]
+    clauses = [m.end() for m in CLAUSE_BREAK_PATTERN.finditer(text)]
+
+    return _BreakIndex(
+        tiers=[
+            ([pos for pos, _ in sentence_tier], [brk for _, brk in sentence_tier]),
+            (newlines, [pos + 1 for pos in newlines]),
+            (word_breaks, [pos + 1 for pos in word_breaks]),
+            (clauses, clauses),
+        ],
+        spaces=[m.start() for m in re.finditer(' ', text)],
+    )
+
+
+def _last_valid_break(
+    positions: list[int],
+    breaks: list[int],
+    low: int,
+    high: int,
+    starts: list[int],
+    ends: list[int]
+) -> int | None:
+    """Return the break for the highest position in (low, high] outside protected content."""
+    idx = bisect.bisect_right(positions, high) - 1
+
+    while idx >= 0 and positions[idx] > low:
+        protected = _get_protected_range_at(positions[idx], starts, ends)
+        if protected:
+            # Jump over the whole protected range
+            idx = bisect.bisect_left(positions, protected[0]) - 1
+            continue
+        if not _get_protected_range_at(breaks[idx] - 1, starts, ends):
+            return breaks[idx]
+        idx -= 1
+
     return None
 
 
@@ -99,7 +274,9 @@ def _find_break_point(
     text: str,
     start: int,
     max_end: int,
-    protected_ranges: list[tuple[int, int]]
+    starts: list[int],
+    ends: list[int],
+    break_index: _BreakIndex | None = None
 ) -> int:
     """
     Find the best break point for a chunk, never breaking inside protected content.
@@ -108,7 +285,9 @@ def _find_break_point(
         text: The full text
         start: Start of current chunk
         max_end: Maximum end position (chunk_size from start)
-        protected_ranges: List of protected (start, end) ranges
+        starts: Sorted start positions of protected ranges
+        ends: End positions of protected ranges (parallel to starts)
+        break_index: Precomputed break positions for text (built if not given)
 
     Returns:
         Best end position for the chunk
@@ -117,7 +296,7 @@ def _find_break_point(
         return len(text)
 
     # Check if max_end is inside a protected range
-    protected = _get_protected_range_at(max_end, protected_ranges)
+    protected = _get_protected_range_at(max_end, starts, ends)
     if protected:
         # We're inside protected content - we must break before it starts
         # Find a break point before the protected range
@@ -127,135 +306,321 @@ def _find_break_point(
             # We must include the entire protected content
             return protected[1]
 
+    if break_index is None:
+        break_index = _build_break_index(text)
+
     # Search backward from max_end to find a good break point
     # Search in the last 50% of the chunk for flexibility
     search_start = start + int((max_end - start) * 0.5)
 
-    best_break = None
-    best_priority = 100  # Lower is better
-
-    for i in range(max_end, search_start, -1):
-        # Skip if inside protected range
-        if _get_protected_range_at(i, protected_ranges):
-            continue
-
-        # Check for different break types
-        priority = None
-        break_pos = None
-
-        # Priority 1: Paragraph boundary
-        if i < len(text) - 1 and text[i:i+2] == '\n\n':
-            priority = 1
-            break_pos = i + 2
-        # Priority 2: English sentence end followed by space or newline
-        elif i > 0 and text[i-1] in '.!?' and text[i] in ' \n':
-            priority = 2
-            break_pos = i + 1
-        # Priority 2b: Japanese sentence end (。！？) - no space needed after
-        elif i > 0 and text[i-1] in JAPANESE_SENTENCE_END:
-            priority = 2
-            break_pos = i
-        # Priority 3: Newline
-        elif text[i] == '\n':
-            priority = 3
-            break_pos = i + 1
-        # Priority 4: Space (word boundary for English)
-        elif text[i] == ' ':
-            priority = 4
-            break_pos = i + 1
-        # Priority 5: Japanese clause break (、読点) - natural pause point
-        elif i > 0 and text[i-1] in JAPANESE_CLAUSE_BREAK:
-            priority = 5
-            break_pos = i
-
-        if priority is not None and break_pos is not None:
-            # Make sure break_pos is not inside protected content
-            if not _get_protected_range_at(break_pos - 1, protected_ranges):
-                if priority < best_priority:
-                    best_priority = priority
-                    best_break = break_pos
-                    # If we found paragraph or sentence break, use it
-                    if priority <= 2:
-                        break
-
-    if best_break is not None:
-        return best_break
+    for positions, breaks in break_index.tiers:
+        best_break = _last_valid_break(
+            positions, breaks, search_start, max_end, starts, ends
+        )
+        if best_break is not None:
+            return best_break
 
     # Fallback: find any space before max_end
-    for i in range(max_end, start, -1):
-        if text[i] == ' ' and not _get_protected_range_at(i, protected_ranges):
-            return i + 1
+    idx = bisect.bisect_right(break_index.spaces, max_end) - 1
+    while idx >= 0 and break_index.spaces[idx] > start:
+        if not _get_protected_range_at(break_index.spaces[idx], starts, ends):
+            return break_index.spaces[idx] + 1
+        idx -= 1
 
     # Last resort: if we still can't find a break, use max_end
     # but make sure we're not in protected content
-    if _get_protected_range_at(max_end - 1, protected_ranges):
-        # Find the end of this protected range
-        for range_start, range_end in protected_ranges:
-            if range_start <= max_end - 1 < range_end:
-                return range_end
+    protected = _get_protected_range_at(max_end - 1, starts, ends)
+    if protected:
+        # Use the end of this protected range
+        return protected[1]
 
     return max_end
 
 
-def _merge_small_chunks(chunks: list[str], min_chunk_size: int, max_chunk_size: int) -> list[str]:
+def _iter_merged_chunks(
+    chunks: Iterable[str], min_chunk_size: int, max_chunk_size: int
+) -> Iterator[str]:
     """
     Merge chunks that are smaller than min_chunk_size with adjacent chunks.
 
     Args:
-        chunks: List of text chunks
+        chunks: Text chunks (consumed lazily)
         min_chunk_size: Minimum acceptable chunk size
         max_chunk_size: Maximum chunk size after merging (can exceed by 50% for small chunks)
 
-    Returns:
-        List of merged chunks
+    Yields:
+        Merged chunks
     """
-    if not chunks or len(chunks) <= 1:
-        return chunks
-
     # Allow exceeding max_chunk_size by 50% when merging small chunks
     merge_limit = int(max_chunk_size * 1.5)
 
-    merged = []
-    current = chunks[0]
+    # Run of chunks to be joined into the current merged chunk
+    current_parts = []
+    current_len = 0
 
-    for i in range(1, len(chunks)):
-        next_chunk = chunks[i]
+    for next_chunk in chunks:
+        if not current_parts:
+            current_parts = [next_chunk]
+            current_len = len(next_chunk)
+            continue
 
-        # If current chunk is small, try to merge
-        if len(current) < min_chunk_size:
-            if len(current) + len(next_chunk) + 1 <= merge_limit:
-                current = current + " " + next_chunk
-            else:
-                merged.append(current)
-                current = next_chunk
-        # If next chunk is small, try to merge
-        elif len(next_chunk) < min_chunk_size:
-            if len(current) + len(next_chunk) + 1 <= merge_limit:
-                current = current + " " + next_chunk
-            else:
-                merged.append(current)
-                current = next_chunk
+        # Merge if either side is small and the result stays within the limit.
+        # A run that could not absorb its neighbour here cannot absorb it later
+        # either, so no separate head/tail passes are needed.
+        is_small = current_len < min_chunk_size or len(next_chunk) < min_chunk_size
+        if is_small and current_len + len(next_chunk) + 1 <= merge_limit:
+            current_parts.append(next_chunk)
+            current_len += len(next_chunk) + 1
         else:
-            merged.append(current)
-            current = next_chunk
+            yield " ".join(current_parts)
+            current_parts = [next_chunk]
+            current_len = len(next_chunk)
 
     # Don't forget the last chunk
-    if current:
-        merged.append(current)
+    if current_parts:
+        yield " ".join(current_parts)
 
-    # Second pass: try to merge any remaining small chunks at the end
-    if len(merged) > 1 and len(merged[-1]) < min_chunk_size:
-        if len(merged[-2]) + len(merged[-1]) + 1 <= merge_limit:
-            merged[-2] = merged[-2] + " " + merged[-1]
-            merged.pop()
 
-    # Third pass: merge small chunks at the beginning
-    if len(merged) > 1 and len(merged[0]) < min_chunk_size:
-        if len(merged[0]) + len(merged[1]) + 1 <= merge_limit:
-            merged[1] = merged[0] + " " + merged[1]
-            merged.pop(0)
+def _slice_stripped(text: str, start: int, end: int) -> str:
+    """Return text[start:end].strip() without building the unstripped slice first."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return text[start:end]
 
-    return merged
+
+def _count_japanese_chars(text: str) -> int:
+    """Count CJK / full-width characters in text."""
+    return sum(1 for c in text if '\u3000' <= c <= '\u9fff' or '\uff00' <= c <= '\uffef')
+
+
+def _max_tokens(chunk: str, japanese_chars: int, chunk_size: int) -> int:
+    """
+    Token limit for a chunk of the given character size.
+
+    Japanese text uses ~1-2 tokens per character vs ~0.25 for English,
+    so Japanese-heavy chunks get a higher ratio (1.2) than English (0.35).
+    """
+    if japanese_chars > len(chunk) * 0.3:
+        return int(chunk_size * 1.2)  # Japanese: ~1.2 tokens per char
+    return int(chunk_size * 0.35)  # English: ~0.25 tokens per char
+
+
+def _estimate_tokens(text: str, japanese_chars: int) -> int:
+    """
+    Estimate token count from character counts without calling the tokenizer.
+
+    Assumes ~1.2 tokens per Japanese character and ~3.8 characters per token
+    otherwise (3.2 when the text contains a code block).
+    """
+    chars_per_token = 3.2 if '```' in text else 3.8
+    return int(japanese_chars * 1.2 + (len(text) - japanese_chars) / chars_per_token)
+
+
+def _max_token_estimate(text: str, japanese_chars: int) -> int:
+    """
+    Pessimistic token count: ~2 tokens per Japanese character and ~2 characters
+    per token otherwise (URL- and ID-heavy text gets down to ~2.5).
+    """
+    return int(japanese_chars * 2 + (len(text) - japanese_chars) / 2)
+
+
+def _over_token_limit(chunks: list[str], chunk_size: int, tokenizer) -> list[bool]:
+    """
+    Check which chunks exceed their token limit.
+
+    Chunks whose pessimistic estimate is within the limit, and chunks whose
+    typical estimate is more than 15% over it, are settled without the
+    tokenizer; the rest are tokenized (in one batch). With the 0.35 English
+    ratio, only English chunks shorter than ~70% of chunk_size skip the
+    tokenizer, so dense text (URLs, IDs) is still validated.
+    """
+    limits = []
+    counts = []
+    near_limit = []
+
+    for i, chunk in enumerate(chunks):
+        japanese_chars = _count_japanese_chars(chunk)
+        limit = _max_tokens(chunk, japanese_chars, chunk_size)
+        limits.append(limit)
+        upper_bound = _max_token_estimate(chunk, japanese_chars)
+        if upper_bound <= limit:
+            counts.append(upper_bound)  # Clearly under
+            continue
+        estimate = _estimate_tokens(chunk, japanese_chars)
+        counts.append(estimate)
+        if estimate <= limit * 1.15:
+            near_limit.append(i)
+
+    if near_limit:
+        exact_counts = _count_tokens_batch([chunks[i] for i in near_limit], tokenizer)
+        for i, token_count in zip(near_limit, exact_counts):
+            counts[i] = token_count
+
+    return [token_count > limit for token_count, limit in zip(counts, limits)]
+
+
+def _next_chunk_start(text: str, start: int, end: int, overlap: int) -> int | None:
+    """
+    Calculate where the chunk after text[start:end] begins.
+
+    Returns:
+        Next start position, or None if no progress can be made
+    """
+    if overlap > 0 and end < len(text):
+        # Find overlap start point at a word boundary
+        overlap_start = end - overlap
+        if overlap_start <= start:
+            next_start = end
+        else:
+            # Search forward to find a word boundary for overlap
+            next_start = None
+            for i in range(overlap_start, end):
+                if text[i] == ' ':
+                    next_start = i + 1
+                    break
+            if next_start is None:
+                next_start = end
+    else:
+        next_start = end
+
+    # Prevent infinite loop
+    if next_start <= start:
+        next_start = end
+    if next_start <= start:
+        return None
+
+    return next_start
+
+
+def _iter_chunk_spans(
+    text: str,
+    start: int,
+    chunk_size: int,
+    overlap: int,
+    starts: list[int],
+    ends: list[int],
+    break_index: _BreakIndex
+) -> Iterator[tuple[int, int, bool]]:
+    """
+    Plan chunk boundaries from start to the end of text using character positions only.
+
+    Yields:
+        (start, end, validate) tuples; validate is False for the final
+        chunk, which takes everything remaining without token validation
+    """
+    while start < len(text):
+        # Calculate max end for this chunk
+        max_end = min(start + chunk_size, len(text))
+
+        if max_end >= len(text):
+            # Last chunk - take everything remaining
+            yield (start, len(text), False)
+            return
+
+        # Find break point
+        end = _find_break_point(text, start, max_end, starts, ends, break_index)
+
+        # Safety check: ensure we make progress
+        if end <= start:
+            end = max_end
+
+        yield (start, end, True)
+
+        next_start = _next_chunk_start(text, start, end, overlap)
+        if next_start is None:
+            return
+        start = next_start
+
+
+def _iter_chunks(
+    text: str,
+    chunk_size: int,
+    overlap: int,
+    use_tokens: bool,
+    min_chunk_size: int,
+    tokenizer=None,
+) -> Iterator[str]:
+    """Yield chunks of text one at a time (see chunk_text)."""
+    text = text.strip() if text else ""
+    if not text:
+        return
+
+    # For short texts, return as-is
+    if len(text) <= chunk_size:
+        yield text
+        return
+
+    chunks = _iter_raw_chunks(text, chunk_size, overlap, use_tokens, tokenizer)
+
+    # Merge small chunks with adjacent ones
+    if min_chunk_size > 0:
+        chunks = _iter_merged_chunks(chunks, min_chunk_size, chunk_size)
+
+    yield from chunks
+
+
+def _iter_raw_chunks(
+    text: str,
+    chunk_size: int,
+    overlap: int,
+    use_tokens: bool,
+    tokenizer=None,
+) -> Iterator[str]:
+    """Yield token-validated chunks of stripped text, before small-chunk merging."""
+    # Find protected ranges and candidate break positions
+    protected_ranges = _find_protected_ranges(text)
+    protected_starts = [range_start for range_start, _ in protected_ranges]
+    protected_ends = [range_end for _, range_end in protected_ranges]
+    break_index = _build_break_index(text)
+
+    # Get tokenizer if using token-based validation
+    if use_tokens and tokenizer is None:
+        tokenizer = _get_tokenizer()
+
+    spans = _iter_chunk_spans(
+        text, 0, chunk_size, overlap, protected_starts, protected_ends, break_index
+    )
+
+    while True:
+        # Pass 1: plan the next window of chunk boundaries (character positions only)
+        window = list(itertools.islice(spans, CHUNK_VALIDATION_WINDOW))
+        if not window:
+            return
+
+        candidates = [(s, e, validate, _slice_stripped(text, s, e)) for s, e, validate in window]
+        candidates = [c for c in candidates if c[3]]
+
+        if not (use_tokens and tokenizer):
+            yield from (chunk for _, _, _, chunk in candidates)
+            continue
+
+        # Pass 2: token-validate the window (estimate first, batched encode near the limit)
+        over_limit = _over_token_limit([chunk for _, _, _, chunk in candidates], chunk_size, tokenizer)
+
+        for (chunk_start, end, validate, chunk), too_long in zip(candidates, over_limit):
+            if validate and too_long and end - chunk_start > 200:
+                reduced_end = _find_break_point(
+                    text, chunk_start, chunk_start + int(chunk_size * 0.7),
+                    protected_starts, protected_ends, break_index
+                )
+                if reduced_end > chunk_start + 100:
+                    reduced_chunk = _slice_stripped(text, chunk_start, reduced_end)
+                    if reduced_chunk:
+                        # Shortening this chunk shifts every later boundary,
+                        # so re-plan the remainder from here
+                        yield reduced_chunk
+                        resume_at = _next_chunk_start(text, chunk_start, reduced_end, overlap)
+                        if resume_at is None:
+                            return
+                        spans = _iter_chunk_spans(
+                            text, resume_at, chunk_size, overlap,
+                            protected_starts, protected_ends, break_index
+                        )
+                        break
+
+            yield chunk
 
 
 def chunk_text(
@@ -263,7 +628,8 @@ def chunk_text(
     chunk_size: int = 600,
     overlap: int = 0,
     use_tokens: bool = True,
-    min_chunk_size: int = 50
+    min_chunk_size: int = 50,
+    tokenizer=None,
 ) -> list[str]:
     """
     Split text into chunks with smart boundary detection.
@@ -281,107 +647,108 @@ def chunk_text(
         overlap: Overlap between chunks in characters (0 = no overlap, default)
         use_tokens: If True, also validates chunk sizes using token count
         min_chunk_size: Minimum chunk size; smaller chunks are merged (default 50)
+        tokenizer: Optional pre-loaded tiktoken encoder (shared across documents)
 
     Returns:
         List of text chunks
     """
-    if not text or not text.strip():
-        return []
-
-    text = text.strip()
-
-    # For short texts, return as-is
-    if len(text) <= chunk_size:
-        return [text]
+    # Fast path: most Slack messages fit in a single chunk, so skip the
+    # generator pipeline (protected ranges, break index, tokenizer, merging).
+    # str.strip() returns the same object when there is nothing to strip.
+    stripped = text.strip() if text else ""
+    if len(stripped) <= chunk_size:
+        return [stripped] if stripped else []
+
+    if use_tokens and tokenizer is None:
+        tokenizer = _get_tokenizer()
 
-    # Find protected ranges
-    protected_ranges = _find_protected_ranges(text)
+    # Chunking is deterministic, so replayed/re-indexed messages reuse earlier results
+    key = (
+        hashlib.blake2b(stripped.encode("utf-8"), digest_size=16).digest(),
+        chunk_size,
+        overlap,
+        tokenizer.name if use_tokens else None,
+        min_chunk_size,
+    )
+    with _chunk_cache_lock:
+        cached = _chunk_cache.get(key)
+        if cached is not None:
+            _chunk_cache.move_to_end(key)
+            return list(cached)
+
+    chunks = list(_iter_chunks(stripped, chunk_size, overlap, use_tokens, min_chunk_size, tokenizer))
+
+    with _chunk_cache_lock:
+        _chunk_cache[key] = tuple(chunks)
+        while len(_chunk_cache) > _CHUNK_CACHE_MAX_SIZE:
+            _chunk_cache.popitem(last=False)
 
-    # Get tokenizer if using token-based validation
-    tokenizer = _get_tokenizer() if use_tokens else None
+    return chunks
 
-    chunks = []
-    start = 0
 
-    while start < len(text):
-        # Calculate max end for this chunk
-        max_end = min(start + chunk_size, len(text))
+class ChunkColumns(TypedDict):
+    """Chunked documents as parallel lists, one entry per chunk."""
 
-        if max_end >= len(text):
-            # Last chunk - take everything remaining
-            chunk = text[start:].strip()
-            if chunk:
-                chunks.append(chunk)
-            break
+    ids: list[str]
+    texts: list[str]
+    metadatas: list[dict[str, Any]]
 
-        # Find break point
-        end = _find_break_point(text, start, max_end, protected_ranges)
 
-        # Safety check: ensure we make progress
-        if end <= start:
-            end = max_end
-
-        chunk = text[start:end].strip()
-
-        if chunk:
-            # Token-based validation
-            # Japanese text uses ~1-2 tokens per character vs ~0.25 for English
-            # We use a higher ratio (1.2) to accommodate both languages
-            if use_tokens and tokenizer:
-                token_count = _count_tokens(chunk, tokenizer)
-                # Detect if chunk contains significant Japanese text
-                japanese_chars = sum(1 for c in chunk if '\u3000' <= c <= '\u9fff' or '\uff00' <= c <= '\uffef')
-                is_japanese_heavy = japanese_chars > len(chunk) * 0.3
-
-                # Use different token limits for Japanese vs English
-                if is_japanese_heavy:
-                    max_tokens = int(chunk_size * 1.2)  # Japanese: ~1.2 tokens per char
-                else:
-                    max_tokens = int(chunk_size * 0.35)  # English: ~0.25 tokens per char
-
-                if token_count > max_tokens and end - start > 200:
-                    reduced_end = _find_break_point(
-                        text, start, start + int(chunk_size * 0.7), protected_ranges
-                    )
-                    if reduced_end > start + 100:
-                        reduced_chunk = text[start:reduced_end].strip()
-                        if reduced_chunk:
-                            chunk = reduced_chunk
-                            end = reduced_end
-
-            chunks.append(chunk)
-
-        # Calculate next start position
-        if overlap > 0 and end < len(text):
-            # Find overlap start point at a word boundary
-            overlap_start = end - overlap
-            if overlap_start <= start:
-                next_start = end
-            else:
-                # Search forward to find a word boundary for overlap
-                next_start = None
-                for i in range(overlap_start, end):
-                    if text[i] == ' ':
-                        next_start = i + 1
-                        break
-                if next_start is None:
-                    next_start = end
-        else:
-            next_start = end
-
-        # Prevent infinite loop
-        if next_start <= start:
-            next_start = end
-        if next_start <= start:
-            break
+def make_chunk_id(doc_id: str, chunk: str) -> str:
+    """
+    Build the ID of a chunk from its document ID and text.
 
-        start = next_start
+    Args:
+        doc_id: ID of the document the chunk belongs to
+        chunk: Chunk text
 
-    # Merge small chunks with adjacent ones
-    if min_chunk_size > 0 and len(chunks) > 1:
-        chunks = _merge_small_chunks(chunks, min_chunk_size, chunk_size)
+    Returns:
+        "<doc_id>-<content hash>" (the same for the same text on every run)
+    """
+    return f"{doc_id}-{hashlib.blake2b(chunk.encode('utf-8'), digest_size=8).hexdigest()}"
+
+
+def _chunk_document(
+    doc: dict[str, Any],
+    chunk_size: int,
+    overlap: int,
+    use_tokens: bool,
+    tokenizer=None
+) -> tuple[list[str], list[str], list[dict[str, Any]]]:
+    """Chunk a single document dictionary into (ids, texts, metadatas) lists."""
+    text = doc.get("text", "")
+    if not text:
+        return [], [], []
+
+    chunks = chunk_text(text, chunk_size, overlap, use_tokens, tokenizer=tokenizer)
+
+    # Per-document fields are looked up once and shared by every chunk
+    doc_id = doc["id"]
+    metadata_template = {
+        "channel": doc.get("channel", ""),
+        "channel_name": doc.get("channel_name", ""),
+        "user": doc.get("user", ""),
+        "ts": doc.get("ts", ""),
+        "permalink": doc.get("permalink", ""),
+    }
+
+    # IDs are keyed by content rather than position, so unchanged chunks keep
+    # their ID across re-indexing and VectorStore.upsert can skip re-embedding them
+    ids = []
+    texts = []
+    metadatas = []
+    seen: set[str] = set()
+    for i, chunk in enumerate(chunks):
+        chunk_id = make_chunk_id(doc_id, chunk)
+        if chunk_id in seen:
+            # Identical text repeated within one document - keep the first
+            continue
+        seen.add(chunk_id)
+        ids.append(chunk_id)
+        texts.append(chunk)
+        metadatas.append(metadata_template | {"chunk_index": i})
 
-    return chunks
+    return ids, texts, metadatas
 
 
 def chunk_documents(
@@ -389,7 +756,7 @@ def chunk_documents(
     chunk_size: int = 600,
     overlap: int = 0,
     use_tokens: bool = True
-) -> list[dict[str, Any]]:
+) -> ChunkColumns:
     """
     Chunk a list of document dictionaries.
 
@@ -400,42 +767,75 @@ def chunk_documents(
         use_tokens: If True, also validates chunk sizes using token count
 
     Returns:
-        List of chunked documents with structure:
+        Chunks as parallel lists (ready for VectorStore.upsert):
         {
-            "id": "original-id-chunk-0",
-            "text": "chunk text",
-            "metadata": {
-                "channel": "...",
-                "user": "...",
-                "ts": "...",
-                "permalink": "...",
-                "chunk_index": 0
-            }
+            "ids": ["original-id-<content hash>", ...],
+            "texts": ["chunk text", ...],
+            "metadatas": [
+                {
+                    "channel": "...",
+                    "user": "...",
+                    "ts": "...",
+                    "permalink": "...",
+                    "chunk_index": 0
+                },
+                ...
+            ]
         }
     """
-    chunked_docs = []
+    columns = ChunkColumns(ids=[], texts=[], metadatas=[])
 
-    for doc in docs:
-        text = doc.get("text", "")
-        if not text:
-            continue
+    # Share one encoder across all documents (and worker threads)
+    tokenizer = _get_tokenizer() if use_tokens else None
+    chunk_one = partial(
+        _chunk_document,
+        chunk_size=chunk_size,
+        overlap=overlap,
+        use_tokens=use_tokens,
+        tokenizer=tokenizer,
+    )
+
+    if len(docs) >= PARALLEL_CHUNK_MIN_DOCS:
+        # Threads avoid pickling documents; map() preserves input order
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            doc_results = list(executor.map(chunk_one, docs))
+    else:
+        doc_results = [chunk_one(doc) for doc in docs]
+
+    for ids, texts, metadatas in doc_results:
+        columns["ids"].extend(ids)
+        columns["texts"].extend(texts)
+        columns["metadatas"].extend(metadatas)
+
+    print(f"Chunked {len(docs)} documents into {len(columns['ids'])} chunks")
+    return columns
+
+
+def chunk_documents_iter(
+    docs: Iterable[dict[str, Any]],
+    chunk_size: int = 600,
+    overlap: int = 0,
+    use_tokens: bool = True,
+    batch_size: int = 256
+) -> Iterator[ChunkColumns]:
+    """
+    Chunk documents incrementally, yielding chunk columns batch by batch.
 
-        chunks = chunk_text(text, chunk_size, overlap, use_tokens)
-
-        for i, chunk in enumerate(chunks):
-            chunked_doc = {
-                "id": f"{doc['id']}-chunk-{i}",
-                "text": chunk,
-                "metadata": {
-                    "channel": doc.get("channel", ""),
-                    "channel_name": doc.get("channel_name", ""),
-                    "user": doc.get("user", ""),
-                    "ts": doc.get("ts", ""),
-                    "permalink": doc.get("permalink", ""),
-                    "chunk_index": i,
-                },
-            }
-            chunked_docs.append(chunked_doc)
+    Only batch_size documents (and their chunks) are held in memory at a time,
+    so callers can upsert each batch before the next one is chunked.
 
-    print(f"Chunked {len(docs)} documents into {len(chunked_docs)} chunks")
-    return chunked_docs
+    Args:
+        docs: Iterable of documents with 'text' field (consumed lazily)
+        chunk_size: Target chunk size in characters (450-750 recommended)
+        overlap: Overlap between chunks in characters (0 = no overlap, default)
+        use_tokens: If True, also validates chunk sizes using token count
+        batch_size: Number of documents chunked per yielded batch
+
+    Yields:
+        Non-empty chunk columns in the same format as chunk_documents()
+    """
+    doc_iter = iter(docs)
+    while batch := list(itertools.islice(doc_iter, batch_size)):
+        columns = chunk_documents(batch, chunk_size=chunk_size, overlap=overlap, use_tokens=use_tokens)
+        if columns["ids"]:
+            yield columns
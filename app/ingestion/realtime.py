@@ -1,40 +1,33 @@
 """Real-time indexing for Slack messages."""
 
 import logging
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from slack_sdk import WebClient
 
-from app.ingestion.chunk import chunk_documents
-from app.ingestion.slack_fetch import get_channel_name
-from app.rag.store import VectorStore
+from app.ingestion.chunk import chunk_documents_iter
+from app.ingestion.slack_fetch import PERMALINK_FETCH_WORKERS, get_channel_name
+from app.rag.store import get_store
 from app.utils.slack_links import get_permalink
 
 logger = logging.getLogger(__name__)
 
+# Pages queued for index_document_pages' writer before fetching the next page waits
+MAX_PENDING_PAGES = 2
 
-def normalize_slack_message(
-    client: WebClient, message: dict[str, Any]
-) -> dict[str, Any] | None:
+
+def _indexable_fields(message: dict[str, Any]) -> tuple[str, str, str, str] | None:
     """
-    Normalize a raw Slack event message into a document format.
+    Validate a raw Slack event message and extract the fields needed for indexing.
 
     Args:
-        client: Slack WebClient instance
         message: Raw Slack message event dict
 
     Returns:
-        Normalized document dict or None if message should be skipped
-        Document structure:
-        {
-            "id": "channel-ts",
-            "channel": "C123...",
-            "text": "message text",
-            "user": "U123...",
-            "ts": "1234567890.123456",
-            "thread_ts": "1234567890.123456" (optional),
-            "permalink": "https://..."
-        }
+        (channel, ts, user, text) or None if message should be skipped
     """
     # Skip bot messages
     if message.get("bot_id") or message.get("subtype") == "bot_message":
@@ -56,26 +49,103 @@ def normalize_slack_message(
         logger.warning("Message missing channel or ts: %s", message)
         return None
 
-    # Get permalink and channel name
-    permalink = get_permalink(client, channel, ts)
-    channel_name = get_channel_name(client, channel)
-
-    # Build document
-    doc = {
-        "id": f"{channel}-{ts}",
-        "channel": channel,
-        "channel_name": channel_name,
-        "text": text,
-        "user": user,
-        "ts": ts,
-        "permalink": permalink or "",
+    return channel, ts, user, text
+
+
+def normalize_slack_messages_batch(
+    client: WebClient, messages: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """
+    Normalize raw Slack event messages into documents, fetching Slack metadata in bulk.
+
+    Channel names are resolved once per unique channel and permalinks are
+    built locally (see get_permalink), instead of two API calls per message.
+
+    Args:
+        client: Slack WebClient instance
+        messages: List of raw Slack message event dicts
+
+    Returns:
+        Normalized document dicts (see normalize_slack_message), in input
+        order, with skipped messages omitted
+    """
+    # Filter out bot/empty/malformed messages in one pass
+    kept = []
+    for message in messages:
+        fields = _indexable_fields(message)
+        if fields:
+            kept.append((message, fields))
+
+    if not kept:
+        return []
+
+    # Warm the channel name cache once per channel
+    channel_names = {
+        channel: get_channel_name(client, channel)
+        for channel in {channel for _, (channel, _, _, _) in kept}
     }
 
-    # Include thread_ts if present
-    if "thread_ts" in message:
-        doc["thread_ts"] = message["thread_ts"]
+    # Get permalinks; any chat.getPermalink fallbacks run concurrently and
+    # map() preserves input order
+    if len(kept) == 1:
+        message, (channel, ts, _, _) = kept[0]
+        permalinks = [get_permalink(client, channel, ts, message.get("thread_ts"))]
+    else:
+        with ThreadPoolExecutor(max_workers=PERMALINK_FETCH_WORKERS) as executor:
+            permalinks = list(executor.map(
+                lambda item: get_permalink(
+                    client, item[1][0], item[1][1], item[0].get("thread_ts")
+                ),
+                kept,
+            ))
 
-    return doc
+    docs = []
+    for (message, (channel, ts, user, text)), permalink in zip(kept, permalinks):
+        # Build document
+        doc = {
+            "id": f"{channel}-{ts}",
+            "channel": channel,
+            "channel_name": channel_names[channel],
+            "text": text,
+            "user": user,
+            "ts": ts,
+            "permalink": permalink or "",
+        }
+
+        # Include thread_ts if present
+        if "thread_ts" in message:
+            doc["thread_ts"] = message["thread_ts"]
+
+        docs.append(doc)
+
+    return docs
+
+
+def normalize_slack_message(
+    client: WebClient, message: dict[str, Any]
+) -> dict[str, Any] | None:
+    """
+    Normalize a raw Slack event message into a document format.
+
+    Args:
+        client: Slack WebClient instance
+        message: Raw Slack message event dict
+
+    Returns:
+        Normalized document dict or None if message should be skipped
+        Document structure:
+        {
+            "id": "channel-ts",
+            "channel": "C123...",
+            "text": "message text",
+            "user": "U123...",
+            "ts": "1234567890.123456",
+            "thread_ts": "1234567890.123456" (optional),
+            "permalink": "https://..."
+        }
+    """
+    docs = normalize_slack_messages_batch(client, [message])
+    return docs[0] if docs else None
 
 
 def index_slack_messages(
@@ -105,12 +175,8 @@ def index_slack_messages(
     if not messages:
         return 0
 
-    # Normalize messages
-    docs = []
-    for msg in messages:
-        doc = normalize_slack_message(client, msg)
-        if doc:
-            docs.append(doc)
+    # Normalize messages (channel names and permalinks fetched in bulk)
+    docs = normalize_slack_messages_batch(client, messages)
 
     if not docs:
         logger.info("No messages to index after normalization")
@@ -118,21 +184,7 @@ def index_slack_messages(
 
     logger.info("Normalized %d messages for indexing", len(docs))
 
-    # Chunk documents
-    chunks = chunk_documents(docs, chunk_size=chunk_size, overlap=overlap)
-
-    if not chunks:
-        logger.warning("No chunks created from %d documents", len(docs))
-        return 0
-
-    logger.info("Created %d chunks from %d messages", len(chunks), len(docs))
-
-    # Upsert to vector store (embeddings generated automatically if needed)
-    store = VectorStore()
-    store.upsert(chunks)
-
-    logger.info("Successfully indexed %d chunks from %d messages", len(chunks), len(docs))
-    return len(chunks)
+    return index_documents(docs, chunk_size=chunk_size, overlap=overlap)
 
 
 def index_slack_message(
@@ -188,18 +240,69 @@ def index_documents(
     if not docs:
         return 0
 
-    # Chunk documents
-    chunks = chunk_documents(docs, chunk_size=chunk_size, overlap=overlap)
+    store = get_store()
+
+    # Chunk and upsert batch by batch so large backfills never hold every chunk at once
+    num_chunks = 0
+    for batch in chunk_documents_iter(docs, chunk_size=chunk_size, overlap=overlap):
+        store.upsert(batch["ids"], batch["texts"], batch["metadatas"])
+        num_chunks += len(batch["ids"])
 
-    if not chunks:
+    if not num_chunks:
         logger.warning("No chunks created from %d documents", len(docs))
         return 0
 
-    logger.info("Created %d chunks from %d documents", len(chunks), len(docs))
+    logger.info("Successfully indexed %d chunks from %d documents", num_chunks, len(docs))
+    return num_chunks
 
-    # Upsert to vector store
-    store = VectorStore()
-    store.upsert(chunks)
 
-    logger.info("Successfully indexed %d chunks from %d documents", len(chunks), len(docs))
-    return len(chunks)
+def index_document_pages(
+    pages: Iterable[list[dict[str, Any]]],
+    chunk_size: int = 600,
+    overlap: int = 100,
+    on_page: Callable[[int, int], None] | None = None,
+) -> tuple[int, int]:
+    """
+    Index pages of normalized documents while the next page is still being produced.
+
+    Each page is handed to one writer thread running index_documents() (which
+    keeps Chroma writes serial), so fetching a page (e.g. from
+    iter_channel_message_pages) overlaps with chunking, embedding and storing
+    the previous ones. At most MAX_PENDING_PAGES pages wait for the writer:
+    the producer blocks until the oldest is indexed, and an indexing error is
+    raised as soon as its page is reached.
+
+    Args:
+        pages: Iterable of document lists (see index_documents)
+        chunk_size: Target chunk size (400-800 chars recommended)
+        overlap: Overlap between chunks (80-120 chars recommended)
+        on_page: Called with (pages, documents) indexed so far after each page
+
+    Returns:
+        (number of documents, number of chunks indexed)
+    """
+    num_pages = 0
+    num_docs = 0
+    num_chunks = 0
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="index-pages") as writer:
+        pending: deque[tuple[Future, int]] = deque()
+
+        def finish_oldest() -> None:
+            nonlocal num_pages, num_docs, num_chunks
+            future, page_size = pending.popleft()
+            num_chunks += future.result()
+            num_pages += 1
+            num_docs += page_size
+            if on_page:
+                on_page(num_pages, num_docs)
+
+        for page in pages:
+            if len(pending) >= MAX_PENDING_PAGES:
+                finish_oldest()
+            pending.append((writer.submit(index_documents, page, chunk_size, overlap), len(page)))
+
+        while pending:
+            finish_oldest()
+
+    return num_docs, num_chunks
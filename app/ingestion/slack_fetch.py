@@ -1,16 +1,34 @@
 """Fetch messages from Slack channels."""
 
+import json
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from app.settings import settings
 from app.utils.slack_links import get_permalink
 
-# Cache for channel ID -> channel name mapping
-_channel_name_cache: dict[str, str] = {}
+# Messages per conversations.history page (Slack's maximum). Pages must be
+# requested in cursor order, so bigger pages mean fewer sequential round-trips.
+HISTORY_PAGE_SIZE = 999
 
+# Concurrent chat.getPermalink fallback requests (see get_permalink) per page
+PERMALINK_FETCH_WORKERS = 8
 
+# Newest ingested message ts per channel ID, kept by the ingest scripts
+# (stored next to the Chroma data) so reruns only fetch newer messages
+WATERMARKS_FILENAME = "ingest_watermarks.json"
+
+# Reverse lookup of channel name -> ID, filled from conversations_list
+_channel_id_cache: dict[str, str] = {}
+
+
+@lru_cache(maxsize=4096)
 def get_channel_name(client: WebClient, channel_id: str) -> str:
     """
     Get channel name from channel ID (with caching).
@@ -22,24 +40,50 @@ def get_channel_name(client: WebClient, channel_id: str) -> str:
     Returns:
         Channel name or channel_id if not found
     """
-    if channel_id in _channel_name_cache:
-        return _channel_name_cache[channel_id]
-
     try:
         response = client.conversations_info(channel=channel_id)
-        channel_name = response["channel"]["name"]
-        _channel_name_cache[channel_id] = channel_name
-        return channel_name
+        return response["channel"]["name"]
     except SlackApiError as e:
-        # For DMs or inaccessible channels, return the ID
+        # For DMs or inaccessible channels, return the ID (cached like a name)
         print(f"Could not get channel name for {channel_id}: {e}")
-        _channel_name_cache[channel_id] = channel_id
         return channel_id
 
 
+def _list_channel_ids(client: WebClient) -> dict[str, str]:
+    """
+    List every public and private channel visible to the bot, following pagination.
+
+    Args:
+        client: Slack WebClient instance
+
+    Returns:
+        Mapping of channel name to channel ID
+    """
+    channel_ids = {}
+    cursor = None
+
+    while True:
+        response = client.conversations_list(
+            types="public_channel,private_channel",
+            limit=1000,
+            cursor=cursor
+        )
+        for channel in response["channels"]:
+            channel_ids[channel["name"]] = channel["id"]
+
+        cursor = response.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            break
+
+    return channel_ids
+
+
 def get_channel_id(client: WebClient, channel_name: str) -> str | None:
     """
-    Get channel ID from channel name.
+    Get channel ID from channel name (with caching).
+
+    The full channel list is fetched on the first lookup and whenever a name
+    is not in the cache (e.g. a newly created channel).
 
     Args:
         client: Slack WebClient instance
@@ -51,65 +95,73 @@ def get_channel_id(client: WebClient, channel_name: str) -> str | None:
     # Strip # if present
     channel_name = channel_name.lstrip("#")
 
+    if channel_name in _channel_id_cache:
+        return _channel_id_cache[channel_name]
+
     try:
-        response = client.conversations_list(types="public_channel,private_channel")
-        for channel in response["channels"]:
-            if channel["name"] == channel_name:
-                return channel["id"]
+        _channel_id_cache.update(_list_channel_ids(client))
     except SlackApiError as e:
         print(f"Error fetching channel list: {e}")
 
-    return None
+    return _channel_id_cache.get(channel_name)
 
 
-def fetch_channel_messages(
-    client: WebClient, channel_id: str, limit: int = 1000
-) -> list[dict[str, Any]]:
+def iter_channel_message_pages(
+    client: WebClient, channel_id: str, limit: int = 1000, oldest: str | None = None
+) -> Iterator[list[dict[str, Any]]]:
     """
-    Fetch messages from a Slack channel.
+    Fetch messages from a Slack channel one conversations.history page at a time.
+
+    Lets callers start indexing a page while the next one is being fetched.
+    Fewer than limit messages in total means the channel's history (newer
+    than oldest) was fetched completely; reaching limit may have left older
+    messages unfetched.
 
     Args:
         client: Slack WebClient instance
         channel_id: Channel ID
         limit: Maximum number of messages to fetch
+        oldest: Only fetch messages newer than this ts (None = no lower bound)
 
-    Returns:
-        List of message documents with structure:
-        {
-            "id": "ts-based-id",
-            "channel": "Cxxxx",
-            "channel_name": "general",
-            "text": "...",
-            "user": "Uxxxx",
-            "ts": "1712345678.9012",
-            "permalink": "https://..."
-        }
+    Yields:
+        Lists of message documents (see fetch_channel_messages), newest page first
+
+    Raises:
+        SlackApiError: If a page can't be fetched (pages yielded so far stay valid)
     """
-    messages = []
     cursor = None
     fetched = 0
 
     # Get channel name once for all messages
     channel_name = get_channel_name(client, channel_id)
 
-    try:
+    with ThreadPoolExecutor(max_workers=PERMALINK_FETCH_WORKERS) as executor:
         while fetched < limit:
             response = client.conversations_history(
-                channel=channel_id, limit=min(200, limit - fetched), cursor=cursor
+                channel=channel_id,
+                limit=min(HISTORY_PAGE_SIZE, limit - fetched),
+                cursor=cursor,
+                oldest=oldest,
             )
 
-            for msg in response["messages"]:
-                # Skip messages without text (e.g., file uploads without text)
-                if "text" not in msg or not msg["text"].strip():
-                    continue
+            # Skip messages without text (e.g., file uploads without text)
+            page = [
+                msg for msg in response["messages"]
+                if "text" in msg and msg["text"].strip()
+            ][: limit - fetched]
 
-                # Skip bot messages if desired (optional)
-                # if msg.get("bot_id"):
-                #     continue
+            # Skip bot messages if desired (optional)
+            # page = [msg for msg in page if not msg.get("bot_id")]
 
-                permalink = get_permalink(client, channel_id, msg["ts"])
+            # Permalinks are built locally; if that fails, the chat.getPermalink
+            # fallback requests for the page run concurrently
+            permalinks = executor.map(
+                lambda msg: get_permalink(client, channel_id, msg["ts"], msg.get("thread_ts")),
+                page,
+            )
 
-                doc = {
+            docs = [
+                {
                     "id": f"{channel_id}-{msg['ts']}",
                     "channel": channel_id,
                     "channel_name": channel_name,
@@ -118,11 +170,14 @@ def fetch_channel_messages(
                     "ts": msg["ts"],
                     "permalink": permalink or "",
                 }
-                messages.append(doc)
-                fetched += 1
+                for msg, permalink in zip(page, permalinks)
+            ]
+            if docs:
+                yield docs
 
-                if fetched >= limit:
-                    break
+            fetched += len(page)
+            if fetched >= limit:
+                break
 
             # Check for more messages
             if not response.get("has_more"):
@@ -132,8 +187,69 @@ def fetch_channel_messages(
             if not cursor:
                 break
 
+
+def load_ingest_watermarks() -> dict[str, str]:
+    """
+    Load the newest ingested message ts per channel ID from earlier ingest runs.
+
+    Returns:
+        Mapping of channel ID to message ts (empty if no run has completed)
+    """
+    path = Path(settings.chroma_persist_directory) / WATERMARKS_FILENAME
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Could not read {path}, fetching full history: {e}")
+        return {}
+
+
+def save_ingest_watermarks(watermarks: dict[str, str]) -> None:
+    """
+    Save the newest ingested message ts per channel ID.
+
+    Args:
+        watermarks: Mapping of channel ID to message ts
+    """
+    path = Path(settings.chroma_persist_directory) / WATERMARKS_FILENAME
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(watermarks, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"Could not save {path}: {e}")
+
+
+def fetch_channel_messages(
+    client: WebClient, channel_id: str, limit: int = 1000
+) -> list[dict[str, Any]]:
+    """
+    Fetch messages from a Slack channel.
+
+    Args:
+        client: Slack WebClient instance
+        channel_id: Channel ID
+        limit: Maximum number of messages to fetch
+
+    Returns:
+        List of message documents with structure:
+        {
+            "id": "ts-based-id",
+            "channel": "Cxxxx",
+            "channel_name": "general",
+            "text": "...",
+            "user": "Uxxxx",
+            "ts": "1712345678.9012",
+            "permalink": "https://..."
+        }
+    """
+    messages = []
+    try:
+        for page in iter_channel_message_pages(client, channel_id, limit):
+            messages.extend(page)
     except SlackApiError as e:
         print(f"Error fetching messages: {e}")
 
+    channel_name = get_channel_name(client, channel_id)
     print(f"Fetched {len(messages)} messages from channel #{channel_name} ({channel_id})")
     return messages
@@ -1,47 +1,31 @@
 """Startup indexing - catch up on messages missed while bot was offline."""
 
+import json
 import logging
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
-from app.ingestion.slack_fetch import get_channel_name, fetch_channel_messages
-from app.ingestion.realtime import index_documents
-from app.rag.store import VectorStore
-
-logger = logging.getLogger(__name__)
+from app.ingestion.channels import list_channels
+from app.ingestion.slack_fetch import fetch_channel_messages
+from app.settings import settings
 
+if TYPE_CHECKING:
+    from app.rag.store import VectorStore
 
-def get_joined_channels(client: WebClient) -> list[dict]:
-    """Get all channels the bot is a member of."""
-    channels = []
-    cursor = None
-
-    try:
-        while True:
-            response = client.conversations_list(
-                types="public_channel,private_channel",
-                exclude_archived=True,
-                limit=200,
-                cursor=cursor,
-            )
-
-            for channel in response["channels"]:
-                if channel.get("is_member", False):
-                    channels.append({
-                        "id": channel["id"],
-                        "name": channel["name"],
-                    })
+logger = logging.getLogger(__name__)
 
-            cursor = response.get("response_metadata", {}).get("next_cursor")
-            if not cursor:
-                break
+# Catch-up messages that were fetched but not yet indexed (stored next to the Chroma data)
+PENDING_DOCS_FILENAME = "startup_pending.jsonl"
 
-    except SlackApiError as e:
-        logger.error(f"Error fetching channels: {e}")
 
-    return channels
+def get_joined_channels(client: WebClient) -> list[dict]:
+    """Get all channels the bot is a member of (public and private, never cached)."""
+    return list_channels(client, types="public_channel,private_channel", only_joined=True)
 
 
 def fetch_recent_messages(
@@ -65,7 +49,7 @@ def fetch_recent_messages(
         List of normalized message documents
     """
     messages = []
-    oldest = (datetime.now() - timedelta(hours=hours)).timestamp()
+    oldest = time.time() - hours * 3600
 
     try:
         response = client.conversations_history(
@@ -76,7 +60,7 @@ def fetch_recent_messages(
 
         for msg in response.get("messages", []):
             # Skip bot messages
-            if msg.get("bot_id") or msg.get("subtype") == "bot_message":
+            if "bot_id" in msg or msg.get("subtype") == "bot_message":
                 continue
 
             # Skip messages without text
@@ -104,10 +88,46 @@ def fetch_recent_messages(
     return messages
 
 
+def _pending_docs_path() -> Path:
+    """Path of the file holding fetched-but-unindexed catch-up messages."""
+    return Path(settings.chroma_persist_directory) / PENDING_DOCS_FILENAME
+
+
+def _load_pending_docs() -> list[dict]:
+    """Load messages saved by a catch-up run whose indexing failed (JSON lines)."""
+    path = _pending_docs_path()
+    if not path.exists():
+        return []
+
+    try:
+        with path.open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading pending catch-up messages: {e}")
+        return []
+
+
+def _save_pending_docs(docs: list[dict]) -> None:
+    """Save fetched catch-up messages (JSON lines) until they are indexed."""
+    path = _pending_docs_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            f.writelines(json.dumps(doc, ensure_ascii=False) + "\n" for doc in docs)
+    except OSError as e:
+        logger.error(f"Error saving pending catch-up messages: {e}")
+
+
+def _clear_pending_docs() -> None:
+    """Remove the pending catch-up messages file after a successful index."""
+    _pending_docs_path().unlink(missing_ok=True)
+
+
 def startup_index(
     client: WebClient,
     hours: int = 24,
     limit_per_channel: int = 500,
+    channels: list[dict] | None = None,
 ) -> int:
     """
     Index recent messages from all joined channels.
@@ -117,88 +137,159 @@ def startup_index(
         client: Slack WebClient
         hours: How many hours back to index (default: 24)
         limit_per_channel: Max messages per channel (default: 500)
+        channels: Joined channels from get_joined_channels (fetched if not given)
 
     Returns:
         Total number of chunks indexed
     """
+    # Deferred: importing the store pulls in chromadb and openai
+    from app.ingestion.realtime import index_documents
+    from app.rag.store import get_store
+
     logger.info(f"Starting catch-up indexing (last {hours} hours)...")
     print(f"📥 Catch-up indexing: fetching messages from last {hours} hours...")
 
     # Get joined channels
-    channels = get_joined_channels(client)
+    if channels is None:
+        channels = get_joined_channels(client)
     if not channels:
         logger.info("No channels to index")
         return 0
 
     print(f"   Found {len(channels)} channels to check")
 
-    total_messages = 0
     total_chunks = 0
-    all_docs = []
 
-    # Collect messages from all channels
-    for channel in channels:
-        channel_id = channel["id"]
+    # Messages keyed by document ID - a message is indexed at most once per run.
+    # Messages fetched by an earlier run whose indexing failed are replayed first.
+    all_docs = {doc["id"]: doc for doc in _load_pending_docs()}
+    if all_docs:
+        print(f"   Replaying {len(all_docs)} messages left over from a failed catch-up")
+
+    # Collect messages from all channels, fetching channels concurrently
+    # (WebClient is safe to share across threads)
+    with ThreadPoolExecutor(max_workers=settings.slack_max_concurrent_requests) as executor:
+        channel_messages = list(executor.map(
+            lambda channel: fetch_recent_messages(
+                client, channel["id"], channel["name"], hours, limit_per_channel
+            ),
+            channels,
+        ))
+
+    store = get_store()
+
+    for channel, messages in zip(channels, channel_messages):
         channel_name = channel["name"]
 
-        messages = fetch_recent_messages(
-            client, channel_id, channel_name, hours, limit_per_channel
-        )
+        # Drop messages indexed by a previous run before they are chunked or embedded
+        if messages:
+            indexed_ts = get_indexed_message_ts(
+                store, channel["id"], [msg["ts"] for msg in messages]
+            )
+            if indexed_ts:
+                messages = [msg for msg in messages if msg["ts"] not in indexed_ts]
 
         if messages:
-            all_docs.extend(messages)
-            total_messages += len(messages)
+            for msg in messages:
+                all_docs.setdefault(msg["id"], msg)
             logger.info(f"Found {len(messages)} recent messages in #{channel_name}")
 
     if not all_docs:
         print("   No new messages to index")
         return 0
 
+    docs = list(all_docs.values())
+    total_messages = len(docs)
     print(f"   Found {total_messages} messages across {len(channels)} channels")
 
+    # Keep the fetched messages on disk until indexing succeeds, so a retry
+    # doesn't have to fetch them from Slack again
+    _save_pending_docs(docs)
+
     # Index all at once (deduplication handled by ChromaDB via document IDs)
     try:
-        num_chunks = index_documents(all_docs)
+        num_chunks = index_documents(docs)
         total_chunks = num_chunks
+        _clear_pending_docs()
         print(f"   ✅ Indexed {num_chunks} chunks from {total_messages} messages")
     except Exception as e:
         logger.error(f"Error indexing documents: {e}")
         print(f"   ❌ Error indexing: {e}")
 
     # Show total store count
-    store = VectorStore()
     print(f"   Total documents in store: {store.count()}")
 
     return total_chunks
 
 
-def get_indexed_channel_ids(store: VectorStore) -> set[str]:
+def get_indexed_channel_ids(store: "VectorStore", channel_ids: set[str]) -> set[str]:
     """
-    Get the set of channel IDs that have at least one document in the vector store.
+    Get the subset of channel_ids that have at least one document in the vector store.
+
+    Each channel is probed with a limit=1 metadata filter that returns IDs only,
+    instead of scanning (and deserializing) metadata for the whole collection.
+    The probes are independent reads, so they run concurrently.
+
+    Args:
+        store: Vector store to check
+        channel_ids: Channel IDs to look for
+
+    Returns:
+        Channel IDs with at least one indexed document
     """
-    try:
-        # Query all documents and extract unique channel IDs from metadata
-        # ChromaDB doesn't have a direct "distinct" query, so we fetch a sample
+    def has_documents(channel_id: str) -> bool:
         result = store.collection.get(
-            limit=10000,  # Get up to 10k docs to check channels
-            include=["metadatas"]
+            where={"channel": channel_id},
+            include=[],
+            limit=1,
         )
+        return bool(result["ids"])
 
-        channel_ids = set()
-        if result and result.get("metadatas"):
-            for metadata in result["metadatas"]:
-                if metadata and metadata.get("channel"):
-                    channel_ids.add(metadata["channel"])
-
-        return channel_ids
+    try:
+        channel_ids = list(channel_ids)
+        with ThreadPoolExecutor(max_workers=settings.slack_max_concurrent_requests) as executor:
+            return {
+                channel_id
+                for channel_id, indexed in zip(channel_ids, executor.map(has_documents, channel_ids))
+                if indexed
+            }
     except Exception as e:
         logger.error(f"Error getting indexed channels: {e}")
         return set()
 
 
+def get_indexed_message_ts(
+    store: "VectorStore", channel_id: str, message_ts: list[str]
+) -> set[str]:
+    """
+    Get the timestamps of messages in a channel that already have chunks in the vector store.
+
+    Args:
+        store: Vector store to check
+        channel_id: Channel ID
+        message_ts: Message timestamps to look for
+
+    Returns:
+        Subset of message_ts that is already indexed
+    """
+    if not message_ts:
+        return set()
+
+    try:
+        result = store.collection.get(
+            where={"$and": [{"channel": channel_id}, {"ts": {"$in": message_ts}}]},
+            include=["metadatas"],
+        )
+        return {metadata["ts"] for metadata in result["metadatas"] if metadata}
+    except Exception as e:
+        logger.error(f"Error checking indexed messages for {channel_id}: {e}")
+        return set()
+
+
 def check_and_index_new_channels(
     client: WebClient,
     limit_per_channel: int = 1000,
+    joined_channels: list[dict] | None = None,
 ) -> int:
     """
     Check for channels the bot has joined but haven't been indexed yet.
@@ -207,15 +298,19 @@ def check_and_index_new_channels(
     Args:
         client: Slack WebClient
         limit_per_channel: Max messages to index per new channel
+        joined_channels: Joined channels from get_joined_channels (fetched if not given)
 
     Returns:
         Number of new channels indexed
     """
+    from app.rag.store import get_store
+
     logger.info("Checking for unindexed channels...")
     print("🔍 Checking for new channels that need indexing...")
 
     # Get all channels bot is member of
-    joined_channels = get_joined_channels(client)
+    if joined_channels is None:
+        joined_channels = get_joined_channels(client)
     if not joined_channels:
         print("   No channels found")
         return 0
@@ -223,8 +318,8 @@ def check_and_index_new_channels(
     joined_channel_ids = {ch["id"] for ch in joined_channels}
 
     # Get channels already in vector store
-    store = VectorStore()
-    indexed_channel_ids = get_indexed_channel_ids(store)
+    store = get_store()
+    indexed_channel_ids = get_indexed_channel_ids(store, joined_channel_ids)
 
     # Find channels that are joined but not indexed
     new_channel_ids = joined_channel_ids - indexed_channel_ids
@@ -240,27 +335,48 @@ def check_and_index_new_channels(
     for ch in new_channels:
         print(f"      - #{ch['name']}")
 
-    # Index each new channel
+    # Fetch new channels concurrently; index them in channel order as fetches complete
     total_indexed = 0
-    for channel in new_channels:
-        channel_id = channel["id"]
-        channel_name = channel["name"]
+    with ThreadPoolExecutor(max_workers=settings.slack_max_concurrent_requests) as executor:
+        futures = [
+            executor.submit(fetch_channel_messages, client, channel["id"], limit=limit_per_channel)
+            for channel in new_channels
+        ]
 
-        print(f"   📥 Indexing #{channel_name}...")
+        for channel, future in zip(new_channels, futures):
+            total_indexed += _index_fetched_channel(channel["name"], future)
 
-        try:
-            messages = fetch_channel_messages(client, channel_id, limit=limit_per_channel)
+    print(f"   Total documents in store: {store.count()}")
+    return total_indexed
 
-            if messages:
-                num_chunks = index_documents(messages)
-                print(f"      ✅ Indexed {num_chunks} chunks from {len(messages)} messages")
-                total_indexed += 1
-            else:
-                print(f"      No messages found in #{channel_name}")
 
-        except Exception as e:
-            logger.error(f"Error indexing channel {channel_name}: {e}")
-            print(f"      ❌ Error: {e}")
+def _index_fetched_channel(channel_name: str, future: Future) -> int:
+    """
+    Index the messages fetched for one new channel.
 
-    print(f"   Total documents in store: {store.count()}")
-    return total_indexed
+    Args:
+        channel_name: Channel name (for progress output)
+        future: Pending fetch_channel_messages result
+
+    Returns:
+        1 if the channel was indexed, otherwise 0
+    """
+    from app.ingestion.realtime import index_documents
+
+    print(f"   📥 Indexing #{channel_name}...")
+
+    try:
+        messages = future.result()
+
+        if messages:
+            num_chunks = index_documents(messages)
+            print(f"      ✅ Indexed {num_chunks} chunks from {len(messages)} messages")
+            return 1
+
+        print(f"      No messages found in #{channel_name}")
+
+    except Exception as e:
+        logger.error(f"Error indexing channel {channel_name}: {e}")
+        print(f"      ❌ Error: {e}")
+
+    return 0
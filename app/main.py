@@ -1,9 +1,10 @@
 """Main entry point for the Slack RAG bot."""
 
-from slack_sdk import WebClient
-
-from app.rag.answer import ask
 from app.settings import settings
+from app.utils.slack_client import get_slack_client
+
+# Inputs that end the CLI test prompt
+_QUIT_COMMANDS = frozenset({"quit", "exit", "q"})
 
 
 def main():
@@ -16,45 +17,59 @@ def main():
     if settings.get_socket_mode_token():
         # Run startup catch-up indexing before starting the bot
         if settings.startup_index_enabled:
-            from app.ingestion.startup import startup_index, check_and_index_new_channels
+            from app.ingestion.startup import (
+                check_and_index_new_channels,
+                get_joined_channels,
+                startup_index,
+            )
+
+            client = get_slack_client()
 
-            client = WebClient(token=settings.slack_bot_token)
+            # List joined channels once and share it between both passes
+            channels = get_joined_channels(client)
 
             # First, check for any channels that were joined while bot was offline
             # and haven't been indexed yet
-            check_and_index_new_channels(client)
+            check_and_index_new_channels(client, joined_channels=channels)
 
             # Then, catch up on recent messages from all channels
-            startup_index(client, hours=settings.startup_index_hours)
+            startup_index(client, hours=settings.startup_index_hours, channels=channels)
 
         # Start Socket Mode
         from app.slack_app import start_socket_mode
 
         start_socket_mode()
     else:
-        print("Socket Mode token not found. Running in CLI test mode.")
-        print("Set SLACK_APP_TOKEN or SOCKET_MODE_TOKEN in .env to run Socket Mode.")
-        print("\nAsk a question (or 'quit' to exit):")
+        _run_cli()
 
-        while True:
-            try:
-                question = input("\n> ").strip()
 
-                if question.lower() in ["quit", "exit", "q"]:
-                    print("Goodbye!")
-                    break
+def _run_cli():
+    """Run a simple CLI test prompt (used when no Socket Mode token is configured)."""
+    from app.rag.answer import ask
 
-                if not question:
-                    continue
+    print("Socket Mode token not found. Running in CLI test mode.")
+    print("Set SLACK_APP_TOKEN or SOCKET_MODE_TOKEN in .env to run Socket Mode.")
+    print("\nAsk a question (or 'quit' to exit):")
 
-                answer = ask(question)
-                print(f"\n{answer}")
+    while True:
+        try:
+            question = input("\n> ").strip()
 
-            except KeyboardInterrupt:
-                print("\nGoodbye!")
+            if question.lower() in _QUIT_COMMANDS:
+                print("Goodbye!")
                 break
-            except Exception as e:
-                print(f"Error: {e}")
+
+            if not question:
+                continue
+
+            answer = ask(question)
+            print(f"\n{answer}")
+
+        except KeyboardInterrupt:
+            print("\nGoodbye!")
+            break
+        except Exception as e:
+            print(f"Error: {e}")
 
 
 if __name__ == "__main__":
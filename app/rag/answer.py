@@ -1,14 +1,28 @@
 """LLM-based question answering with RAG."""
 
 import logging
-
-from openai import OpenAI
+from collections.abc import Iterator
+from functools import lru_cache
 
 from app.rag.search import RetrievedChunk, search
 from app.settings import settings
+from app.utils.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
+# Instructions shared by every question; sent as the system message
+SYSTEM_PROMPT = """You are a helpful assistant answering questions using only the provided context from Slack messages.
+
+Rules:
+- Answer based ONLY on the context in the user message
+- If the answer isn't in the context, say "I couldn't find that information in the channel history."
+- Be concise and direct
+- DO NOT fabricate or make assumptions beyond the provided context"""
+
+# Fallback replies when retrieval finds nothing usable
+NO_RESULTS_MESSAGE = "I couldn't find any relevant information in the indexed messages for this channel."
+LOW_CONFIDENCE_MESSAGE = "I couldn't find enough relevant information in this channel's indexed messages to answer that confidently."
+
 
 class AnswerGenerator:
     """Generate answers using RAG with OpenAI."""
@@ -20,25 +34,25 @@ class AnswerGenerator:
         Args:
             model: OpenAI model to use for generation
         """
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
         self.model = model or settings.llm_model
 
-    def generate_answer(
+    def _build_messages(
         self, question: str, context_chunks: list[RetrievedChunk]
-    ) -> str:
+    ) -> tuple[list[dict[str, str]], dict[str, None]]:
         """
-        Generate an answer based on question and context documents.
+        Build the chat messages and collect source permalinks for a question.
 
         Args:
             question: User question
             context_chunks: List of context chunks from vector search
 
         Returns:
-            Generated answer with sources
+            (messages for chat.completions, source permalinks in retrieval-rank order)
         """
         # Build context from documents
         context_parts = []
-        sources = set()
+        sources: dict[str, None] = {}  # Insertion-ordered set: most relevant source first
 
         for i, chunk in enumerate(context_chunks, 1):
             text = chunk.text
@@ -52,30 +66,43 @@ class AnswerGenerator:
                 context_parts.append(f"[{i}] {text}")
 
             if permalink:
-                sources.add(permalink)
+                sources[permalink] = None
 
         context_text = "\n\n".join(context_parts)
 
-        # Build prompt
-        prompt = f"""You are a helpful assistant answering questions using only the provided context from Slack messages.
-
-Rules:
-- Answer based ONLY on the context below
-- If the answer isn't in the context, say "I couldn't find that information in the channel history."
-- Be concise and direct
-- DO NOT fabricate or make assumptions beyond the provided context
-
-Question:
+        # Build prompt (rules live in SYSTEM_PROMPT so the prefix is identical across calls)
+        prompt = f"""Question:
 {question}
 
 Context:
 {context_text}"""
 
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        return messages, sources
+
+    def generate_answer(
+        self, question: str, context_chunks: list[RetrievedChunk]
+    ) -> str:
+        """
+        Generate an answer based on question and context documents.
+
+        Args:
+            question: User question
+            context_chunks: List of context chunks from vector search
+
+        Returns:
+            Generated answer with sources
+        """
+        messages, sources = self._build_messages(question, context_chunks)
+
         # Generate answer
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 max_completion_tokens=2000,
             )
 
@@ -83,39 +110,106 @@ Context:
 
             # Add sources
             if sources:
-                sources_text = "\n\nSources:\n" + "\n".join(f"- {url}" for url in sorted(sources))
-                answer += sources_text
+                answer += _format_sources(sources)
 
             return answer
 
         except Exception as e:
             return f"Error generating answer: {e}"
 
+    def stream_answer(
+        self, question: str, context_chunks: list[RetrievedChunk]
+    ) -> Iterator[str]:
+        """
+        Generate an answer like generate_answer(), yielding text as it is produced.
 
-def ask(question: str, top_k: int = 5, debug: bool = False) -> str:
+        Args:
+            question: User question
+            context_chunks: List of context chunks from vector search
+
+        Yields:
+            Pieces of the answer; the sources block is yielded last
+        """
+        messages, sources = self._build_messages(question, context_chunks)
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_completion_tokens=2000,
+                stream=True,
+            )
+
+            generated = False
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    generated = True
+                    yield content
+
+            if not generated:
+                yield "No answer generated."
+
+            # Add sources
+            if sources:
+                yield _format_sources(sources)
+
+        except Exception as e:
+            yield f"Error generating answer: {e}"
+
+
+def _format_sources(sources: dict[str, None]) -> str:
+    """Format source permalinks as the trailing "Sources:" block of an answer."""
+    return "\n\nSources:\n" + "\n".join(f"- {url}" for url in sources)
+
+
+@lru_cache(maxsize=1)
+def get_answer_generator() -> AnswerGenerator:
     """
-    Ask a question using RAG.
+    Get the process-wide AnswerGenerator (built once).
+
+    The OpenAI client is thread-safe and keeps its HTTP connections alive, so
+    concurrent Slack handlers share it instead of reconnecting per question.
+    """
+    return AnswerGenerator()
+
+
+def _retrieve(
+    question: str, top_k: int, debug: bool
+) -> tuple[list[RetrievedChunk], str | None]:
+    """
+    Retrieve context for a question and decide whether it is good enough to answer from.
 
     Args:
         question: User question
         top_k: Number of context documents to retrieve
-        debug: If True, include debug information in output
+        debug: If True, print debug information
 
     Returns:
-        Generated answer with sources (or fallback message)
+        (retrieved chunks, fallback message or None if the LLM should answer)
     """
     # Search for relevant documents
     chunks = search(question, top_k=top_k)
 
     # Case 1: No chunks retrieved at all
     if not chunks:
-        message = "I couldn't find any relevant information in the indexed messages for this channel."
         if debug:
             print(f"[DEBUG] No chunks retrieved")
-        return message
-
-    # Get top similarity score
-    top_score = max(chunk.score for chunk in chunks)
+        return chunks, NO_RESULTS_MESSAGE
+
+    # Single pass: top similarity score plus the top-3 sources used by the
+    # low-confidence fallback
+    top_score = float("-inf")
+    low_confidence_sources = []
+    for i, chunk in enumerate(chunks):
+        if chunk.score > top_score:
+            top_score = chunk.score
+        if i < 3:
+            permalink = chunk.metadata.get("permalink", "")
+            if permalink:
+                low_confidence_sources.append(permalink)
 
     # Debug output
     if debug:
@@ -131,26 +225,56 @@ def ask(question: str, top_k: int = 5, debug: bool = False) -> str:
             print(f"[DEBUG] Below threshold ({top_score:.4f} < {settings.min_similarity}) -> using fallback")
 
         # Build low confidence response with top 3 sources
-        low_confidence_chunks = chunks[:3]
-        sources = []
-        for chunk in low_confidence_chunks:
-            permalink = chunk.metadata.get("permalink", "")
-            if permalink:
-                sources.append(permalink)
+        if not low_confidence_sources:
+            return chunks, LOW_CONFIDENCE_MESSAGE
 
-        message = "I couldn't find enough relevant information in this channel's indexed messages to answer that confidently."
-
-        if sources:
-            message += "\n\nSources (possibly related but low confidence):\n"
-            message += "\n".join(f"- {url}" for url in sources)
-
-        return message
+        parts = [LOW_CONFIDENCE_MESSAGE, "\n\nSources (possibly related but low confidence):"]
+        parts.extend([f"\n- {url}" for url in low_confidence_sources])
+        return chunks, "".join(parts)
 
     # Case 3: Normal flow - generate answer with LLM
     if debug:
         print(f"[DEBUG] Above threshold ({top_score:.4f} >= {settings.min_similarity}) -> generating answer")
 
-    generator = AnswerGenerator()
-    answer = generator.generate_answer(question, chunks)
+    return chunks, None
+
+
+def ask(question: str, top_k: int = 5, debug: bool = False) -> str:
+    """
+    Ask a question using RAG.
+
+    Args:
+        question: User question
+        top_k: Number of context documents to retrieve
+        debug: If True, include debug information in output
+
+    Returns:
+        Generated answer with sources (or fallback message)
+    """
+    chunks, fallback = _retrieve(question, top_k, debug)
+    if fallback is not None:
+        return fallback
+
+    generator = get_answer_generator()
+    return generator.generate_answer(question, chunks)
+
+
+def ask_stream(question: str, top_k: int = 5, debug: bool = False) -> Iterator[str]:
+    """
+    Ask a question using RAG, yielding the answer as it is generated.
+
+    Args:
+        question: User question
+        top_k: Number of context documents to retrieve
+        debug: If True, include debug information in output
+
+    Yields:
+        Pieces of the answer (a fallback message is yielded whole)
+    """
+    chunks, fallback = _retrieve(question, top_k, debug)
+    if fallback is not None:
+        yield fallback
+        return
 
-    return answer
+    generator = get_answer_generator()
+    yield from generator.stream_answer(question, chunks)
@@ -1,25 +1,128 @@
 """OpenAI embeddings with rate limit handling."""
 
+import hashlib
+import sqlite3
+import threading
 import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
-from openai import OpenAI, RateLimitError
+from openai import RateLimitError
 
 from app.settings import settings
+from app.utils.openai_client import get_openai_client
+
+# Embeddings keyed by (model, dimensions, content hash), shared by every EmbeddingClient.
+# Vectors are stored as float32 arrays (~8x smaller than lists of floats); Chroma
+# keeps float32 vectors too, so the narrower type loses nothing that gets indexed.
+_EMBEDDING_CACHE_MAX_SIZE = 2048
+_embedding_cache: OrderedDict[tuple[str, int | None, bytes], array] = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+# Optional on-disk second tier (EMBEDDING_CACHE_PATH, SQLite): survives restarts
+# and isn't bounded by _EMBEDDING_CACHE_MAX_SIZE
+_disk_cache_lock = threading.Lock()
+
+# Hashes looked up per SQLite query (stays under SQLite's bound-parameter limit)
+_DISK_CACHE_LOOKUP_BATCH = 500
+
+# Embedding requests in flight at once in embed_documents
+EMBED_CONCURRENCY = 8
+
+# Texts per embeddings API request (keeps 600-char chunks well under the
+# per-request input and token limits)
+EMBED_BATCH_SIZE = 256
+
+
+def clear_embedding_cache() -> None:
+    """Clear the in-memory embedding cache (the on-disk cache is kept)."""
+    with _embedding_cache_lock:
+        _embedding_cache.clear()
+
+
+def _text_hash(text: str) -> bytes:
+    """Hash a text for the embedding caches, ignoring whitespace-only differences."""
+    return hashlib.blake2b(" ".join(text.split()).encode("utf-8"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=1)
+def _get_disk_cache() -> sqlite3.Connection | None:
+    """Open the on-disk embedding cache (None if EMBEDDING_CACHE_PATH is unset)."""
+    if not settings.embedding_cache_path:
+        return None
+
+    path = Path(settings.embedding_cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embeddings ("
+        "model TEXT NOT NULL, dimensions INTEGER NOT NULL, text_hash BLOB NOT NULL, "
+        "vector BLOB NOT NULL, PRIMARY KEY (model, dimensions, text_hash)) WITHOUT ROWID"
+    )
+    conn.commit()
+    return conn
+
+
+def _load_disk_embeddings(
+    model: str, dimensions: int | None, text_hashes: list[bytes]
+) -> dict[bytes, array]:
+    """Look up embeddings in the on-disk cache; returns the hits by text hash."""
+    conn = _get_disk_cache()
+    if conn is None:
+        return {}
+
+    found = {}
+    with _disk_cache_lock:
+        for start in range(0, len(text_hashes), _DISK_CACHE_LOOKUP_BATCH):
+            batch = text_hashes[start:start + _DISK_CACHE_LOOKUP_BATCH]
+            rows = conn.execute(
+                "SELECT text_hash, vector FROM embeddings WHERE model = ? AND dimensions = ? "
+                f"AND text_hash IN ({','.join('?' * len(batch))})",
+                (model, dimensions or 0, *batch),
+            )
+            for text_hash, vector in rows:
+                found[text_hash] = array("f", vector)
+    return found
+
+
+def _store_disk_embeddings(
+    model: str, dimensions: int | None, vectors: dict[bytes, array]
+) -> None:
+    """Save new embeddings to the on-disk cache."""
+    conn = _get_disk_cache()
+    if conn is None or not vectors:
+        return
+
+    with _disk_cache_lock:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+            [
+                (model, dimensions or 0, text_hash, vector.tobytes())
+                for text_hash, vector in vectors.items()
+            ],
+        )
+        conn.commit()
 
 
 class EmbeddingClient:
     """Client for generating embeddings with OpenAI."""
 
-    def __init__(self, model: str | None = None):
+    def __init__(self, model: str | None = None, dimensions: int | None = None):
         """
         Initialize the embedding client.
 
         Args:
             model: OpenAI embedding model to use
+            dimensions: Output vector size for text-embedding-3 models
+                (None = model default, e.g. 1536 for text-embedding-3-small)
         """
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
         self.model = model or settings.embedding_model
+        self.dimensions = dimensions or settings.embedding_dimensions
 
     def embed_texts(
         self, texts: list[str], max_retries: int = 3, retry_delay: int = 2
@@ -27,6 +130,12 @@ class EmbeddingClient:
         """
         Generate embeddings for a list of texts with rate limit retry.
 
+        Texts embedded before (by any client, same model) are served from an
+        in-memory cache, then from the on-disk cache if EMBEDDING_CACHE_PATH is
+        set; texts differing only in whitespace share an entry. Only the
+        remaining unique texts are sent to OpenAI, EMBED_BATCH_SIZE texts per
+        request.
+
         Args:
             texts: List of texts to embed
             max_retries: Maximum number of retries on rate limit
@@ -38,9 +147,69 @@ class EmbeddingClient:
         if not texts:
             return []
 
+        keys = [(self.model, self.dimensions, _text_hash(text)) for text in texts]
+
+        embeddings: list[list[float] | None] = [None] * len(texts)
+        missing: dict[tuple[str, int | None, bytes], list[int]] = {}
+
+        with _embedding_cache_lock:
+            for i, key in enumerate(keys):
+                cached = _embedding_cache.get(key)
+                if cached is not None:
+                    _embedding_cache.move_to_end(key)
+                    embeddings[i] = cached.tolist()
+                else:
+                    missing.setdefault(key, []).append(i)
+
+        if missing:
+            disk_hits = _load_disk_embeddings(
+                self.model, self.dimensions, [key[2] for key in missing]
+            )
+            if disk_hits:
+                with _embedding_cache_lock:
+                    for key in [key for key in missing if key[2] in disk_hits]:
+                        vector = disk_hits[key[2]]
+                        embedding = vector.tolist()
+                        for i in missing.pop(key):
+                            embeddings[i] = embedding
+                        _embedding_cache[key] = vector
+                    while len(_embedding_cache) > _EMBEDDING_CACHE_MAX_SIZE:
+                        _embedding_cache.popitem(last=False)
+
+        if missing:
+            # Embed each distinct missing text once
+            missing_texts = [texts[indices[0]] for indices in missing.values()]
+            new_embeddings = []
+            for start in range(0, len(missing_texts), EMBED_BATCH_SIZE):
+                new_embeddings.extend(self._create_embeddings(
+                    missing_texts[start:start + EMBED_BATCH_SIZE], max_retries, retry_delay
+                ))
+
+            new_vectors = {}
+            with _embedding_cache_lock:
+                for (key, indices), embedding in zip(missing.items(), new_embeddings):
+                    for i in indices:
+                        embeddings[i] = embedding
+                    _embedding_cache[key] = new_vectors[key[2]] = array("f", embedding)
+                while len(_embedding_cache) > _EMBEDDING_CACHE_MAX_SIZE:
+                    _embedding_cache.popitem(last=False)
+
+            _store_disk_embeddings(self.model, self.dimensions, new_vectors)
+
+        return embeddings
+
+    def _create_embeddings(
+        self, texts: list[str], max_retries: int, retry_delay: int
+    ) -> list[list[float]]:
+        """Call the OpenAI embeddings API with exponential backoff on rate limits."""
         for attempt in range(max_retries):
             try:
-                response = self.client.embeddings.create(input=texts, model=self.model)
+                if self.dimensions:
+                    response = self.client.embeddings.create(
+                        input=texts, model=self.model, dimensions=self.dimensions
+                    )
+                else:
+                    response = self.client.embeddings.create(input=texts, model=self.model)
                 embeddings = [item.embedding for item in response.data]
                 return embeddings
 
@@ -72,6 +241,17 @@ class EmbeddingClient:
         return embeddings[0] if embeddings else []
 
 
+@lru_cache(maxsize=1)
+def get_embedding_client() -> EmbeddingClient:
+    """
+    Get the process-wide EmbeddingClient (built once).
+
+    The OpenAI client keeps its HTTP connections alive, so stores and batch
+    jobs share one instead of reconnecting.
+    """
+    return EmbeddingClient()
+
+
 def embed_documents(
     docs: list[dict[str, Any]], batch_size: int = 100
 ) -> list[dict[str, Any]]:
@@ -85,19 +265,22 @@ def embed_documents(
     Returns:
         List of documents with 'embedding' field added
     """
-    client = EmbeddingClient()
+    client = get_embedding_client()
     embedded_docs = []
 
-    for i in range(0, len(docs), batch_size):
-        batch = docs[i : i + batch_size]
-        texts = [doc["text"] for doc in batch]
+    batches = [docs[i : i + batch_size] for i in range(0, len(docs), batch_size)]
+    print(f"Embedding {len(batches)} batches ({EMBED_CONCURRENCY} concurrent requests)...")
 
-        print(f"Embedding batch {i // batch_size + 1}/{(len(docs) - 1) // batch_size + 1}...")
-        embeddings = client.embed_texts(texts)
+    # Requests are network-bound, so overlap them; map() preserves batch order
+    with ThreadPoolExecutor(max_workers=EMBED_CONCURRENCY) as executor:
+        batch_embeddings = executor.map(
+            lambda batch: client.embed_texts([doc["text"] for doc in batch]), batches
+        )
 
-        for doc, embedding in zip(batch, embeddings):
-            doc["embedding"] = embedding
-            embedded_docs.append(doc)
+        for batch, embeddings in zip(batches, batch_embeddings):
+            for doc, embedding in zip(batch, embeddings):
+                doc["embedding"] = embedding
+                embedded_docs.append(doc)
 
     print(f"Embedded {len(embedded_docs)} documents")
     return embedded_docs
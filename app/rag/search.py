@@ -1,14 +1,15 @@
 """Vector search functionality."""
 
+import io
 import logging
 from dataclasses import dataclass
 
-from app.rag.store import VectorStore
+from app.rag.store import get_store
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RetrievedChunk:
     """A retrieved chunk with text, metadata, and similarity score."""
 
@@ -28,39 +29,34 @@ def search(query: str, top_k: int = 5) -> list[RetrievedChunk]:
     Returns:
         List of RetrievedChunk objects with similarity scores
     """
-    store = VectorStore()
-    results = store.query(query, top_k=top_k)
-
-    chunks = []
-    for result in results:
-        # Convert distance to similarity (for cosine distance: similarity = 1 - distance)
-        distance = result.get("distance", 0.0)
-        similarity = 1.0 - distance
-
-        chunk = RetrievedChunk(
-            text=result.get("text", ""),
-            metadata=result.get("metadata", {}),
-            score=similarity,
-        )
-        chunks.append(chunk)
-
-        # Debug logging for scores
-        permalink = chunk.metadata.get("permalink", "N/A")
-        logger.debug(
-            "Retrieved chunk: score=%.4f, permalink=%s",
-            chunk.score,
-            permalink
-        )
+    store = get_store()
+    _, texts, metadatas, distances = store.query_columns(query, top_k=top_k)
+
+    # Convert distance to similarity (cosine, or inner product over unit vectors: similarity = 1 - distance)
+    chunks = [
+        RetrievedChunk(text=text or "", metadata=metadata or {}, score=1.0 - distance)
+        for text, metadata, distance in zip(texts, metadatas, distances)
+    ]
+
+    # Debug logging for scores
+    if logger.isEnabledFor(logging.DEBUG):
+        for chunk in chunks:
+            logger.debug(
+                "Retrieved chunk: score=%.4f, permalink=%s",
+                chunk.score,
+                chunk.metadata.get("permalink", "N/A")
+            )
 
     return chunks
 
 
-def format_search_results(results: list[RetrievedChunk]) -> str:
+def format_search_results(results: list[RetrievedChunk], truncate: int = 200) -> str:
     """
     Format search results for display.
 
     Args:
         results: List of RetrievedChunk objects
+        truncate: Maximum characters of each chunk's text to show
 
     Returns:
         Formatted string of results
@@ -68,15 +64,17 @@ def format_search_results(results: list[RetrievedChunk]) -> str:
     if not results:
         return "No results found."
 
-    output = []
+    output = io.StringIO()
     for i, chunk in enumerate(results, 1):
         permalink = chunk.metadata.get("permalink", "")
-        text = chunk.text[:200] + "..."  # Truncate for display
+        text = chunk.text
+        if len(text) > truncate:
+            text = text[:truncate] + "..."  # Truncate for display
 
-        output.append(f"{i}. {text}")
+        output.write(f"{i}. {text}\n")
         if permalink:
-            output.append(f"   Source: {permalink}")
-        output.append(f"   Similarity: {chunk.score:.4f}")
-        output.append("")
+            output.write(f"   Source: {permalink}\n")
+        output.write(f"   Similarity: {chunk.score:.4f}\n\n")
 
-    return "\n".join(output)
+    # Single trailing newline after the last result
+    return output.getvalue()[:-1]
@@ -1,13 +1,85 @@
 """Chroma vector database interface."""
 
+import heapq
+import itertools
+import math
+import re
+from functools import lru_cache
 from typing import Any
 
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 
-from app.rag.embed import EmbeddingClient
+from app.rag.embed import EmbeddingClient, get_embedding_client
 from app.settings import settings
 
+# Documents checked and written per Chroma call in VectorStore.upsert
+UPSERT_BATCH_SIZE = 100
+
+# Positional chunk IDs ("<doc_id>-chunk-<i>") written before chunk IDs were content hashes
+_LEGACY_CHUNK_ID = re.compile(r"^(.*)-chunk-\d+$")
+
+
+def _collection_metadata() -> dict[str, Any]:
+    """
+    Collection metadata: inner-product distance plus the HNSW parameters from settings.
+
+    Vectors are normalized before they are stored or queried, so inner product
+    ranks exactly like cosine (distance = 1 - similarity in both spaces) while
+    skipping the per-candidate norm computations. Existing cosine collections
+    keep working unchanged; rebuild_collection() switches them over.
+    """
+    return {
+        "hnsw:space": "ip",
+        "hnsw:M": settings.hnsw_m,
+        "hnsw:construction_ef": settings.hnsw_ef_construction,
+        "hnsw:search_ef": settings.hnsw_ef_search,
+    }
+
+
+def _normalize(vector) -> list[float]:
+    """Scale a vector to unit length (OpenAI embeddings already are, up to rounding)."""
+    norm = math.sqrt(math.fsum(x * x for x in vector))
+    if not norm or abs(norm - 1.0) < 1e-6:
+        return list(vector)
+    return [x / norm for x in vector]
+
+
+@lru_cache(maxsize=1024)
+def _embed_query_cached(embedding_client: EmbeddingClient, query_text: str) -> tuple[float, ...]:
+    """
+    Embed a search query, caching the vector per client and query text.
+
+    Kept separate from the document embedding cache so a large backfill
+    cannot evict frequently asked questions.
+    """
+    return tuple(embedding_client.embed_text(query_text))
+
+
+def query_embedding_cache_info():
+    """Hit/miss statistics for the query embedding cache (functools cache_info)."""
+    return _embed_query_cached.cache_info()
+
+
+@lru_cache(maxsize=None)
+def _get_chroma_client(persist_directory: str):
+    """
+    Get the Chroma client for a persist directory (built once per directory).
+
+    Connects to the Chroma server if CHROMA_HOST is set (keeps the index out
+    of the bot's memory), otherwise opens the embedded database.
+    """
+    if settings.chroma_host:
+        return chromadb.HttpClient(
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+            settings=ChromaSettings(anonymized_telemetry=False),
+        )
+    return chromadb.PersistentClient(
+        path=persist_directory,
+        settings=ChromaSettings(anonymized_telemetry=False),
+    )
+
 
 class VectorStore:
     """Chroma vector database wrapper."""
@@ -25,51 +97,256 @@ class VectorStore:
             persist_directory: Directory to persist the database
         """
         self.persist_directory = persist_directory or settings.chroma_persist_directory
-        self.embedding_client = EmbeddingClient()
 
-        # Initialize Chroma client
-        self.client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=ChromaSettings(anonymized_telemetry=False),
-        )
+        # Clients are shared by every VectorStore in the process
+        self.embedding_client = get_embedding_client()
+        self.client = _get_chroma_client(self.persist_directory)
 
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
-            name=collection_name, metadata={"hnsw:space": "cosine"}
+            name=collection_name, metadata=_collection_metadata()
         )
 
-    def upsert(self, docs: list[dict[str, Any]]) -> None:
+        # ef_search can change in place; M / ef_construction need rebuild_collection()
+        self._apply_search_ef()
+        self._check_embedding_dimensions()
+
+    def _apply_search_ef(self) -> None:
+        """Update an existing collection's HNSW ef_search to match settings."""
+        try:
+            hnsw_config = (self.collection.configuration or {}).get("hnsw") or {}
+            if hnsw_config and hnsw_config.get("ef_search") != settings.hnsw_ef_search:
+                self.collection.modify(
+                    configuration={"hnsw": {"ef_search": settings.hnsw_ef_search}}
+                )
+        except Exception as e:
+            print(f"Could not update HNSW ef_search: {e}")
+
+    def _check_embedding_dimensions(self) -> None:
+        """Warn if stored vectors don't match the configured EMBEDDING_DIMENSIONS."""
+        if not settings.embedding_dimensions:
+            return
+        try:
+            sample = self.collection.get(limit=1, include=["embeddings"])["embeddings"]
+            if sample is not None and len(sample) and len(sample[0]) != settings.embedding_dimensions:
+                print(
+                    f"Vector store holds {len(sample[0])}-d embeddings but "
+                    f"EMBEDDING_DIMENSIONS={settings.embedding_dimensions}; "
+                    "run VectorStore().rebuild_collection(reembed=True) to re-embed"
+                )
+        except Exception as e:
+            print(f"Could not check embedding dimensions: {e}")
+
+    def migrate_legacy_chunk_ids(self, batch_size: int = 1000) -> int:
         """
-        Upsert documents into the vector store.
+        Re-key chunks stored under positional IDs ("<doc_id>-chunk-<i>") by content hash.
+
+        Stored vectors are copied, so nothing is re-embedded. Run once on a
+        collection indexed before chunk IDs were content hashes (see "Migrate
+        chunk IDs" in the README), with the bot and ingest scripts stopped.
+        Until then, re-indexing a document still replaces its old chunks (see
+        upsert), but costs re-embedding them.
 
         Args:
-            docs: List of documents with structure:
-                {
-                    "id": "unique-id",
-                    "text": "document text",
-                    "metadata": {...}
-                }
+            batch_size: Documents read and written per Chroma call
+
+        Returns:
+            Number of legacy chunks migrated
+        """
+        from app.ingestion.chunk import make_chunk_id
+
+        batch_size = min(batch_size, self.client.get_max_batch_size())
+
+        # Collect the legacy IDs first: re-keying while paging would shift the offsets
+        legacy_ids = []
+        offset = 0
+        while True:
+            batch = self.collection.get(include=[], limit=batch_size, offset=offset)
+            if not batch["ids"]:
+                break
+            offset += len(batch["ids"])
+            legacy_ids.extend(doc_id for doc_id in batch["ids"] if _LEGACY_CHUNK_ID.match(doc_id))
+
+        for start in range(0, len(legacy_ids), batch_size):
+            batch = self.collection.get(
+                ids=legacy_ids[start:start + batch_size],
+                include=["documents", "metadatas", "embeddings"],
+            )
+            seen: set[str] = set()
+            ids, texts, metadatas, embeddings = [], [], [], []
+            for old_id, text, metadata, embedding in zip(
+                batch["ids"], batch["documents"], batch["metadatas"], batch["embeddings"]
+            ):
+                new_id = make_chunk_id(_LEGACY_CHUNK_ID.match(old_id)[1], text or "")
+                if new_id in seen:
+                    # Identical text repeated within one document - keep the first
+                    continue
+                seen.add(new_id)
+                ids.append(new_id)
+                texts.append(text)
+                metadatas.append(metadata)
+                embeddings.append(embedding)
+
+            if ids:
+                self.collection.upsert(
+                    ids=ids, documents=texts, metadatas=metadatas, embeddings=embeddings
+                )
+            self.collection.delete(ids=batch["ids"])
+
+        if legacy_ids:
+            print(f"Migrated {len(legacy_ids)} chunks to content-hash IDs")
+        return len(legacy_ids)
+
+    def _delete_stale_chunks(
+        self, ids: list[str], metadatas: list[dict[str, Any]], batch_size: int
+    ) -> None:
+        """
+        Delete stored chunks of the given documents that are not among their new chunk IDs.
+
+        Chunk IDs are content hashes, so re-indexing an edited message leaves
+        its old chunks under IDs the new chunks don't reuse.
+
+        Args:
+            ids: Every chunk ID of the documents being upserted
+            metadatas: Chunk metadata dicts (documents are identified by channel and ts)
+            batch_size: Message timestamps looked up per Chroma call
         """
+        new_ids = set(ids)
+        docs = {
+            (metadata.get("channel"), metadata.get("ts"))
+            for metadata in metadatas
+            if metadata.get("channel") and metadata.get("ts")
+        }
         if not docs:
             return
 
-        ids = [doc["id"] for doc in docs]
-        texts = [doc["text"] for doc in docs]
-        metadatas = [doc.get("metadata", {}) for doc in docs]
+        # Look rows up by ts (indexed metadata) and match the channel here
+        timestamps = sorted({ts for _, ts in docs})
+        stale_ids = []
+        for start in range(0, len(timestamps), batch_size):
+            rows = self.collection.get(
+                where={"ts": {"$in": timestamps[start:start + batch_size]}},
+                include=["metadatas"],
+            )
+            stale_ids.extend(
+                row_id
+                for row_id, metadata in zip(rows["ids"], rows["metadatas"])
+                if row_id not in new_ids
+                and ((metadata or {}).get("channel"), (metadata or {}).get("ts")) in docs
+            )
+
+        for start in range(0, len(stale_ids), batch_size):
+            self.collection.delete(ids=stale_ids[start:start + batch_size])
+
+        if stale_ids:
+            print(f"Removed {len(stale_ids)} outdated chunks")
+
+    def upsert(
+        self,
+        ids: list[str],
+        texts: list[str],
+        metadatas: list[dict[str, Any]],
+        embeddings: list[list[float]] | None = None,
+        batch_size: int = UPSERT_BATCH_SIZE,
+    ) -> None:
+        """
+        Upsert documents into the vector store.
+
+        Takes parallel lists (as returned by chunk_documents) and writes them
+        to Chroma in slices of batch_size (capped at Chroma's max batch size).
+        Embeddings for all new documents are requested together, batched by
+        EmbeddingClient.embed_texts.
+        Chunk IDs are content hashes, so IDs already in the collection hold
+        identical text and are skipped without re-embedding. Afterwards, stored
+        chunks of the same documents (channel and ts) that are no longer among
+        their chunks (e.g. the message was edited) are deleted; pass every
+        chunk of a document in the same call.
+
+        Args:
+            ids: Unique document IDs
+            texts: Document texts
+            metadatas: Document metadata dicts
+            embeddings: Precomputed embeddings (generated if not given)
+            batch_size: Documents checked and written per Chroma call
+        """
+        if not ids:
+            return
+
+        batch_size = min(batch_size, self.client.get_max_batch_size())
 
-        # Generate embeddings if not present
-        if "embedding" in docs[0]:
-            embeddings = [doc["embedding"] for doc in docs]
-        else:
+        # Skip IDs that are already stored
+        keep = []
+        for start in range(0, len(ids), batch_size):
+            batch_ids = ids[start:start + batch_size]
+            existing_ids = set(self.collection.get(ids=batch_ids, include=[])["ids"])
+            keep.extend(
+                i for i, doc_id in enumerate(batch_ids, start) if doc_id not in existing_ids
+            )
+
+        # Every chunk of the upserted documents, for _delete_stale_chunks
+        all_ids, all_metadatas = ids, metadatas
+
+        if len(keep) < len(ids):
+            print(f"Skipping {len(ids) - len(keep)} unchanged documents")
+            if not keep:
+                self._delete_stale_chunks(all_ids, all_metadatas, batch_size)
+                return
+            ids = [ids[i] for i in keep]
+            texts = [texts[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep]
+            if embeddings is not None:
+                embeddings = [embeddings[i] for i in keep]
+
+        # Generate embeddings if not present (one API request per EMBED_BATCH_SIZE texts)
+        if embeddings is None:
             print("Generating embeddings for upsert...")
             embeddings = self.embedding_client.embed_texts(texts)
 
+        # Unit-length vectors make inner product equal to cosine similarity
+        embeddings = [_normalize(embedding) for embedding in embeddings]
+
         # Upsert to Chroma
-        self.collection.upsert(
-            ids=ids, documents=texts, embeddings=embeddings, metadatas=metadatas
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self.collection.upsert(
+                ids=ids[start:end],
+                documents=texts[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end],
+            )
+
+        print(f"Upserted {len(ids)} documents to vector store")
+
+        # Old chunks are only removed once their replacements are stored
+        self._delete_stale_chunks(all_ids, all_metadatas, batch_size)
+
+    def query_columns(
+        self, query_text: str, top_k: int = 5
+    ) -> tuple[list[str], list[str], list[dict[str, Any]], list[float]]:
+        """
+        Query the vector store, returning Chroma's result columns as-is.
+
+        Args:
+            query_text: Query text
+            top_k: Number of results to return
+
+        Returns:
+            (ids, texts, metadatas, distances), parallel lists ordered by distance
+        """
+        # Generate query embedding (repeated questions are served from cache)
+        query_embedding = _normalize(_embed_query_cached(self.embedding_client, query_text))
+
+        # Query Chroma
+        results = self.collection.query(
+            query_embeddings=[query_embedding], n_results=top_k
         )
 
-        print(f"Upserted {len(docs)} documents to vector store")
+        if not (results["ids"] and results["ids"][0]):
+            return [], [], [], []
+
+        ids = results["ids"][0]
+        distances = results["distances"][0] if results["distances"] else [0.0] * len(ids)
+        return ids, results["documents"][0], results["metadatas"][0], distances
 
     def query(
         self, query_text: str, top_k: int = 5
@@ -90,27 +367,67 @@ class VectorStore:
                     "distance": 0.123
                 }
         """
-        # Generate query embedding
-        query_embedding = self.embedding_client.embed_text(query_text)
+        return [
+            {"id": doc_id, "text": text, "metadata": metadata, "distance": distance}
+            for doc_id, text, metadata, distance in zip(
+                *self.query_columns(query_text, top_k=top_k)
+            )
+        ]
 
-        # Query Chroma
-        results = self.collection.query(
-            query_embeddings=[query_embedding], n_results=top_k
+    def exact_query(
+        self, query_text: str, top_k: int = 5, batch_size: int = 1000
+    ) -> list[dict[str, Any]]:
+        """
+        Query by brute force over every stored vector, bypassing the HNSW index.
+
+        Slow on large collections; meant as ground truth for checking the
+        recall of query() (e.g. after changing the HNSW settings; see
+        "Check search recall" in the README).
+
+        Args:
+            query_text: Query text
+            top_k: Number of results to return
+            batch_size: Stored vectors scored per Chroma call
+
+        Returns:
+            Results in the same structure as query()
+        """
+        # numpy comes with chromadb; only this diagnostic needs it
+        import numpy as np
+
+        query_embedding = np.asarray(
+            _normalize(_embed_query_cached(self.embedding_client, query_text)), dtype=np.float32
         )
+        batch_size = min(batch_size, self.client.get_max_batch_size())
 
-        # Format results
-        formatted_results = []
-        if results["ids"] and results["ids"][0]:
-            for i, doc_id in enumerate(results["ids"][0]):
-                result = {
-                    "id": doc_id,
-                    "text": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i] if results["distances"] else 0.0,
-                }
-                formatted_results.append(result)
+        # Keep the top_k best (distance, ...) tuples seen so far
+        best: list[tuple[float, str, str, dict[str, Any]]] = []
+        offset = 0
+        while True:
+            batch = self.collection.get(
+                include=["documents", "metadatas", "embeddings"],
+                limit=batch_size,
+                offset=offset,
+            )
+            if not batch["ids"]:
+                break
+            offset += len(batch["ids"])
+
+            # Stored vectors are unit length, so inner-product distance is 1 - dot
+            distances = 1.0 - np.asarray(batch["embeddings"], dtype=np.float32) @ query_embedding
+            best = heapq.nsmallest(
+                top_k,
+                itertools.chain(
+                    best,
+                    zip(distances.tolist(), batch["ids"], batch["documents"], batch["metadatas"]),
+                ),
+                key=lambda item: item[0],
+            )
 
-        return formatted_results
+        return [
+            {"id": doc_id, "text": text, "metadata": metadata, "distance": distance}
+            for distance, doc_id, text, metadata in best
+        ]
 
     def count(self) -> int:
         """Get the number of documents in the collection."""
@@ -121,6 +438,89 @@ class VectorStore:
         # Delete the collection and recreate it
         self.client.delete_collection(self.collection.name)
         self.collection = self.client.get_or_create_collection(
-            name=self.collection.name, metadata={"hnsw:space": "cosine"}
+            name=self.collection.name, metadata=_collection_metadata()
         )
         print("Deleted all documents from vector store")
+
+    def rebuild_collection(self, batch_size: int = 1000, reembed: bool = False) -> None:
+        """
+        Recreate the collection with the current HNSW settings, keeping all documents.
+
+        Chroma fixes M and ef_construction when a collection is created, so
+        changing them requires copying the stored vectors into a new collection.
+        Changing the embedding model or EMBEDDING_DIMENSIONS makes the stored
+        vectors unusable; reembed=True embeds the stored texts again instead.
+
+        Stop the bot and ingest scripts first: other processes keep a handle
+        to the old collection, which is deleted at the end.
+
+        Args:
+            batch_size: Documents copied per Chroma call
+            reembed: Re-embed documents with the current settings instead of copying vectors
+
+        Raises:
+            RuntimeError: If an earlier rebuild was interrupted mid-swap (needs manual recovery)
+        """
+        name = self.collection.name
+        rebuild_name = f"{name}_rebuild"
+        old_name = f"{name}_old"
+        batch_size = min(batch_size, self.client.get_max_batch_size())
+
+        existing = {c.name for c in self.client.list_collections()}
+        if old_name in existing:
+            # The original was renamed aside but the rebuilt copy never swapped in;
+            # deleting anything now could lose the only full copy
+            raise RuntimeError(
+                f"Collection {old_name!r} exists from an interrupted rebuild; rename it "
+                f"back to {name!r} (or {rebuild_name!r} to {name!r}) before rebuilding"
+            )
+
+        # Start from a clean copy target (left over if a previous rebuild was
+        # interrupted before the swap, so the original is intact)
+        if rebuild_name in existing:
+            self.client.delete_collection(rebuild_name)
+        target = self.client.create_collection(name=rebuild_name, metadata=_collection_metadata())
+
+        copied = 0
+        include = ["documents", "metadatas"] if reembed else ["documents", "metadatas", "embeddings"]
+        while True:
+            batch = self.collection.get(include=include, limit=batch_size, offset=copied)
+            if not batch["ids"]:
+                break
+            if reembed:
+                embeddings = [
+                    _normalize(embedding)
+                    for embedding in self.embedding_client.embed_texts(batch["documents"])
+                ]
+            else:
+                embeddings = batch["embeddings"]
+            target.add(
+                ids=batch["ids"],
+                documents=batch["documents"],
+                metadatas=batch["metadatas"],
+                embeddings=embeddings,
+            )
+            copied += len(batch["ids"])
+
+        # Swap the rebuilt collection in under the original name. The original
+        # is renamed aside first and only deleted once the swap succeeded, so
+        # an interruption never leaves the data without a copy.
+        self.collection.modify(name=old_name)
+        target.modify(name=name)
+        self.client.delete_collection(old_name)
+        self.collection = self.client.get_collection(name)
+        print(f"Rebuilt vector store collection with {copied} documents")
+
+
+@lru_cache(maxsize=1)
+def get_store() -> VectorStore:
+    """
+    Get the process-wide VectorStore (built once).
+
+    Opening a PersistentClient loads the collection's index, so callers share
+    one store instead of constructing VectorStore() per call.
+
+    Returns:
+        VectorStore for the default collection and persist directory
+    """
+    return VectorStore()
@@ -1,5 +1,7 @@
 """Settings loader using Pydantic BaseSettings."""
 
+from functools import cached_property
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,12 +15,21 @@ class Settings(BaseSettings):
     slack_bot_token: str
     slack_app_token: str | None = None  # Socket Mode token (also accepts SOCKET_MODE_TOKEN)
     socket_mode_token: str | None = None  # Alternative name for slack_app_token
+    slack_bot_user_id: str | None = None  # Bot's own user ID (looked up via auth.test if unset)
 
     # Chroma
     chroma_persist_directory: str = ".chroma"
+    chroma_host: str | None = None  # Chroma server to use instead of the embedded database
+    chroma_port: int = 8000
+    # HNSW index parameters (M / ef_construction apply to new collections; see VectorStore.rebuild_collection)
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 100
 
     # Embedding model
     embedding_model: str = "text-embedding-3-small"
+    embedding_dimensions: int | None = None  # Shortened vectors for text-embedding-3 models (requires re-index)
+    embedding_cache_path: str | None = None  # SQLite file caching embeddings across restarts (unset = memory only)
 
     # LLM model
     llm_model: str = "gpt-5-mini-2025-08-07"
@@ -34,6 +45,9 @@ class Settings(BaseSettings):
     startup_index_enabled: bool = True
     startup_index_hours: int = 24  # How many hours back to index on startup
 
+    # Slack API concurrency (channels fetched in parallel during indexing)
+    slack_max_concurrent_requests: int = 8
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -45,6 +59,13 @@ class Settings(BaseSettings):
         """Get Socket Mode token (supports both SLACK_APP_TOKEN and SOCKET_MODE_TOKEN)."""
         return self.slack_app_token or self.socket_mode_token
 
+    @cached_property
+    def realtime_index_channels_set(self) -> frozenset[str]:
+        """REALTIME_INDEX_CHANNELS parsed once into a set (empty = all channels)."""
+        return frozenset(
+            ch.strip() for ch in self.realtime_index_channels.split(",") if ch.strip()
+        )
+
 
 # Global settings instance
 settings = Settings()
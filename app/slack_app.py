@@ -3,26 +3,30 @@
 import logging
 import re
 import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 
-from app.ingestion.realtime import index_slack_message, index_documents
-from app.ingestion.slack_fetch import fetch_channel_messages, get_channel_name
-from app.rag.answer import ask
+from app.ingestion.realtime import index_document_pages, index_slack_message
+from app.ingestion.slack_fetch import get_channel_name, iter_channel_message_pages
+from app.rag.answer import ask, ask_stream
 from app.settings import settings
+from app.utils.slack_client import get_slack_client
 
 logger = logging.getLogger(__name__)
 
-# Initialize Slack app
-app = App(token=settings.slack_bot_token)
+# Initialize Slack app (sharing the process-wide WebClient)
+app = App(client=get_slack_client())
 
 # Store bot user ID (populated on first use)
-_bot_user_id: str | None = None
+_bot_user_id: str | None = settings.slack_bot_user_id
 
 
 def get_bot_user_id(client) -> str:
-    """Get the bot's own user ID (cached)."""
+    """Get the bot's own user ID (from settings, else auth.test once; cached)."""
     global _bot_user_id
     if _bot_user_id is None:
         response = client.auth_test()
@@ -30,51 +34,159 @@ def get_bot_user_id(client) -> str:
     return _bot_user_id
 
 
+# Questions are answered on this pool instead of the Bolt listener threads
+ASK_WORKERS = 16
+_ask_pool = ThreadPoolExecutor(max_workers=ASK_WORKERS, thread_name_prefix="ask")
+
+# Channel backfills run on this pool, so mass invites can't spawn unbounded threads
+INDEX_WORKERS = 4
+_index_pool = ThreadPoolExecutor(max_workers=INDEX_WORKERS, thread_name_prefix="index")
+
+
+def _shutdown_pools() -> None:
+    """
+    Drop queued questions and backfills instead of starting them.
+
+    Called when the Socket Mode handler stops. An atexit hook would be too
+    late: interpreter shutdown joins executor threads (running every queued
+    task) before atexit handlers run.
+    """
+    _ask_pool.shutdown(wait=False, cancel_futures=True)
+    _index_pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Channel IDs allowed for real-time indexing (empty = all), parsed once
+REALTIME_INDEX_CHANNELS = settings.realtime_index_channels_set
+
+# Pages (up to HISTORY_PAGE_SIZE messages each) between progress updates while backfilling a channel
+BACKFILL_PROGRESS_PAGES = 1
+
+# Minimum seconds between backfill status writes (shared by all running backfills)
+BACKFILL_STATUS_INTERVAL = 1.0
+_backfill_status_lock = threading.Lock()
+_last_backfill_status = 0.0
+
+# User mention markup, e.g. <@U123ABC>
+MENTION_PATTERN = re.compile(r"<@[A-Z0-9]+>")
+
+# Minimum seconds between chat.update calls while streaming an answer
+# (chat.update is rate limited to roughly one call per second per channel)
+STREAM_UPDATE_INTERVAL = 1.0
+
+
+def post_streaming_reply(
+    client, channel: str, pieces: Iterable[str], thread_ts: str | None = None
+) -> str:
+    """
+    Post an answer as it is generated: the first text is posted immediately,
+    then the message is edited in place as more text arrives.
+
+    Args:
+        client: Slack WebClient
+        channel: Channel ID to reply in
+        pieces: Answer text pieces (e.g. from ask_stream)
+        thread_ts: Thread to reply in (None = top-level message)
+
+    Returns:
+        The full answer text
+    """
+    text = ""
+    message_ts = None
+    posted_text = ""
+    last_update = 0.0
+
+    for piece in pieces:
+        text += piece
+        if not text.strip():
+            continue
+
+        if message_ts is None:
+            response = client.chat_postMessage(channel=channel, text=text, thread_ts=thread_ts)
+            message_ts = response["ts"]
+            posted_text = text
+            last_update = time.monotonic()
+        elif time.monotonic() - last_update >= STREAM_UPDATE_INTERVAL:
+            client.chat_update(channel=channel, ts=message_ts, text=text)
+            posted_text = text
+            last_update = time.monotonic()
+
+    # Final edit with the complete answer
+    if message_ts is None:
+        client.chat_postMessage(channel=channel, text=text or "No answer generated.", thread_ts=thread_ts)
+    elif text != posted_text:
+        client.chat_update(channel=channel, ts=message_ts, text=text)
+
+    return text
+
+
+def strip_mentions(text: str) -> str:
+    """Remove <@USER_ID> mentions from message text and strip whitespace."""
+    # Fast path: a single mention at the start (the usual "@bot question")
+    if text.startswith("<@"):
+        end = text.find(">")
+        if end != -1 and "<@" not in text[end:] and MENTION_PATTERN.fullmatch(text, 0, end + 1):
+            return text[end + 1:].strip()
+
+    return MENTION_PATTERN.sub("", text).strip()
+
+
 def is_dm_channel(channel_id: str) -> bool:
     """Check if a channel ID is a DM (direct message) channel."""
     # DM channels start with 'D', group DMs start with 'G' (for MPDMs)
     return channel_id.startswith("D")
 
 
-@app.event("app_mention")
-def handle_mention(event, say, logger):
-    """Handle @mention of the bot."""
-    logger.info(f"Received app_mention event: {event}")
+def _answer_mention(event: dict, client, say) -> None:
+    """Answer an @mention in its thread (runs on the ask worker pool)."""
+    thread_ts = event.get("thread_ts") or event["ts"]
     try:
         # Extract question from message (remove bot mention)
         text = event["text"]
         logger.info(f"Full message text: {text}")
 
         # Remove <@BOT_ID> mention
-        question = re.sub(r"<@[A-Z0-9]+>", "", text).strip()
+        question = strip_mentions(text)
         logger.info(f"Question after removing mention: {question}")
 
         if not question:
             logger.info("No question found, asking user to provide one")
-            say(
-                text="Please ask me a question!",
-                thread_ts=event.get("thread_ts") or event["ts"],
-            )
+            say(text="Please ask me a question!", thread_ts=thread_ts)
             return
 
         logger.info(f"Processing question: {question}")
 
+        # Generate answer, streaming it into a thread reply
+        logger.info("Calling ask_stream() to generate answer...")
+        answer = post_streaming_reply(
+            client, event["channel"], ask_stream(question), thread_ts=thread_ts
+        )
+        logger.info(f"Sent answer (length: {len(answer)}): {answer[:100]}...")
+
+    except Exception as e:
+        logger.error(f"Error handling mention: {e}", exc_info=True)
+        say(text=f"Sorry, I encountered an error: {e}", thread_ts=thread_ts)
+
+
+@app.event("app_mention")
+def handle_mention(event, client, say, logger):
+    """Handle @mention of the bot."""
+    logger.info(f"Received app_mention event: {event}")
+    # Answer off the Bolt listener thread so slow LLM calls don't hold up other events
+    _ask_pool.submit(_answer_mention, event, client, say)
+
+
+def _answer_command(question: str, say) -> None:
+    """Answer an /ask question in the channel (runs on the ask worker pool)."""
+    try:
         # Generate answer
-        logger.info("Calling ask() to generate answer...")
         answer = ask(question)
-        logger.info(f"Generated answer (length: {len(answer)}): {answer[:100]}...")
 
-        # Reply in thread
-        logger.info(f"Sending response to Slack...")
-        say(text=answer, thread_ts=event.get("thread_ts") or event["ts"])
-        logger.info("Response sent successfully!")
+        # Reply
+        say(answer)
 
     except Exception as e:
-        logger.error(f"Error handling mention: {e}", exc_info=True)
-        say(
-            text=f"Sorry, I encountered an error: {e}",
-            thread_ts=event.get("thread_ts") or event["ts"],
-        )
+        logger.error(f"Error handling /ask command: {e}")
+        say(f"Sorry, I encountered an error: {e}")
 
 
 @app.command("/ask")
@@ -91,18 +203,27 @@ def handle_ask_command(ack, command, say, logger):
             return
 
         logger.info(f"Question: {question}")
-
-        # Generate answer
-        answer = ask(question)
-
-        # Reply
-        say(answer)
+        _ask_pool.submit(_answer_command, question, say)
 
     except Exception as e:
         logger.error(f"Error handling /ask command: {e}")
         say(f"Sorry, I encountered an error: {e}")
 
 
+def _answer_dm(client, channel_id: str, text: str) -> None:
+    """Answer a DM question in the DM (runs on the ask worker pool)."""
+    try:
+        # Generate answer from indexed messages across all channels,
+        # streaming it into the DM
+        answer = post_streaming_reply(client, channel_id, ask_stream(text, debug=True))
+        print(f"[DM DEBUG] Answer generated: {answer[:100]}...")
+        logger.info("Sent DM response successfully")
+
+    except Exception as e:
+        logger.error(f"Error handling DM: {e}", exc_info=True)
+        client.chat_postMessage(channel=channel_id, text=f"Sorry, I encountered an error: {e}")
+
+
 @app.event("message")
 def handle_message(event, client, say):
     """Handle new messages - DMs for Q&A, channels for real-time indexing."""
@@ -111,9 +232,9 @@ def handle_message(event, client, say):
         if event.get("bot_id") or event.get("subtype") == "bot_message":
             return
 
-        # Skip messages without text
-        text = event.get("text", "").strip()
-        if not text:
+        # Skip messages without text (text can be missing or null, e.g. file shares)
+        text = event.get("text")
+        if not text or not (text := text.strip()):
             return
 
         channel_id = event.get("channel", "")
@@ -123,13 +244,7 @@ def handle_message(event, client, say):
             logger.info(f"Received DM from user {event.get('user')}: {text[:50]}...")
             print(f"[DM DEBUG] Question received: {text}")
 
-            # Generate answer from indexed messages across all channels
-            answer = ask(text, debug=True)
-            print(f"[DM DEBUG] Answer generated: {answer[:100]}...")
-
-            # Reply in DM
-            say(text=answer)
-            logger.info("Sent DM response successfully")
+            _ask_pool.submit(_answer_dm, client, channel_id, text)
             return
 
         # For non-DM messages: real-time indexing
@@ -137,25 +252,20 @@ def handle_message(event, client, say):
             return
 
         # Channel filtering (if configured)
-        if settings.realtime_index_channels:
-            allowed_channels = [
-                ch.strip() for ch in settings.realtime_index_channels.split(",")
-            ]
-
-            # Check if channel ID or name is in allowed list
-            # Note: For channel names, we'd need to resolve them, but for simplicity
-            # we'll just check channel IDs for now
-            if channel_id not in allowed_channels:
-                logger.debug(
-                    "Skipping message from channel %s (not in allowed list)", channel_id
-                )
-                return
+        # Note: For channel names, we'd need to resolve them, but for simplicity
+        # we'll just check channel IDs for now
+        if REALTIME_INDEX_CHANNELS and channel_id not in REALTIME_INDEX_CHANNELS:
+            logger.debug(
+                "Skipping message from channel %s (not in allowed list)", channel_id
+            )
+            return
 
         # Index the message
+        ts = event.get("ts")
         logger.info(
             "Indexing new message: channel=%s ts=%s user=%s",
             channel_id,
-            event.get("ts"),
+            ts,
             event.get("user", "unknown"),
         )
 
@@ -163,7 +273,7 @@ def handle_message(event, client, say):
 
         logger.info(
             "Indexed message ts=%s channel=%s into %d chunks",
-            event.get("ts"),
+            ts,
             channel_id,
             num_chunks,
         )
@@ -179,49 +289,104 @@ def handle_message(event, client, say):
                 pass
 
 
-def _index_channel_background(client, channel_id: str, channel_name: str, limit: int = 1000):
+def _index_channel_background(
+    client, channel_id: str, channel_name: str, limit: int = 1000, status_ts: str | None = None
+):
     """
     Background task to index a channel's history.
     Called when bot joins a new channel.
+
+    Pages are indexed (chunked, embedded and written) while the next page is
+    fetched (see index_document_pages). Progress and the final result are
+    shown by editing one status message (status_ts, posted if not given),
+    updated every BACKFILL_PROGRESS_PAGES pages.
     """
     try:
         logger.info(f"Starting background indexing for #{channel_name} ({channel_id})")
         print(f"📥 Indexing #{channel_name}...")
 
-        # Fetch channel messages
-        messages = fetch_channel_messages(client, channel_id, limit=limit)
+        def report_progress(page_number: int, num_messages: int) -> None:
+            nonlocal status_ts
+            if page_number % BACKFILL_PROGRESS_PAGES == 0:
+                # Progress is cosmetic: a failed edit (rate limited, status
+                # message deleted, ...) must not abort the backfill
+                try:
+                    status_ts = _post_backfill_status(
+                        client, channel_id, status_ts,
+                        f"📥 Indexing this channel's history... indexed {num_messages} messages so far.",
+                        final=False,
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not update backfill progress for #{channel_name}: {e}")
+
+        # Pages are indexed while the next one is fetched
+        num_messages, num_chunks = index_document_pages(
+            iter_channel_message_pages(client, channel_id, limit=limit),
+            on_page=report_progress,
+        )
 
-        if not messages:
+        if not num_messages:
             logger.info(f"No messages found in #{channel_name}")
-            client.chat_postMessage(
-                channel=channel_id,
-                text=f"✅ Indexing complete! No messages found to index in this channel."
+            _post_backfill_status(
+                client, channel_id, status_ts,
+                f"✅ Indexing complete! No messages found to index in this channel."
             )
             return
 
-        # Index the messages
-        num_chunks = index_documents(messages)
-
         logger.info(f"Indexed {num_chunks} chunks from #{channel_name}")
         print(f"✅ Indexed {num_chunks} chunks from #{channel_name}")
 
         # Notify channel
-        client.chat_postMessage(
-            channel=channel_id,
-            text=f"✅ Indexing complete! I've indexed {len(messages)} messages ({num_chunks} chunks) from this channel. You can now ask me questions!"
+        _post_backfill_status(
+            client, channel_id, status_ts,
+            f"✅ Indexing complete! I've indexed {num_messages} messages ({num_chunks} chunks) from this channel. You can now ask me questions!",
         )
 
     except Exception as e:
         logger.error(f"Error indexing channel {channel_name}: {e}", exc_info=True)
         try:
-            client.chat_postMessage(
-                channel=channel_id,
-                text=f"❌ Sorry, I encountered an error while indexing: {e}"
+            _post_backfill_status(
+                client, channel_id, status_ts,
+                f"❌ Sorry, I encountered an error while indexing: {e}"
             )
         except Exception:
             pass
 
 
+def _post_backfill_status(
+    client, channel_id: str, status_ts: str | None, text: str, final: bool = True
+) -> str | None:
+    """
+    Show backfill status by editing the status message (posting it if there is none yet).
+
+    Status writes from all backfills are paced to one per BACKFILL_STATUS_INTERVAL
+    seconds so parallel backfills don't run into Slack rate limits; a progress
+    update (final=False) that would have to wait is skipped instead.
+
+    Returns:
+        ts of the status message (None if it has not been posted yet)
+    """
+    global _last_backfill_status
+    # Reserve the next free slot under the lock; wait for it and call Slack
+    # outside it, so one slow request doesn't hold up every other backfill
+    with _backfill_status_lock:
+        now = time.monotonic()
+        slot = max(now, _last_backfill_status + BACKFILL_STATUS_INTERVAL)
+        if slot > now and not final:
+            return status_ts
+        _last_backfill_status = slot
+
+    if slot > now:
+        time.sleep(slot - now)
+
+    if status_ts:
+        client.chat_update(channel=channel_id, ts=status_ts, text=text)
+    else:
+        status_ts = client.chat_postMessage(channel=channel_id, text=text)["ts"]
+
+    return status_ts
+
+
 @app.event("member_joined_channel")
 def handle_member_joined(event, client, say):
     """
@@ -241,19 +406,16 @@ def handle_member_joined(event, client, say):
     channel_name = get_channel_name(client, channel_id)
     logger.info(f"Bot joined channel #{channel_name} ({channel_id})")
 
-    # Send initial message
-    say(
+    # Send initial message (edited with indexing progress and the final result)
+    response = say(
         text=f"Thanks for inviting me! 🧠 I'm now indexing the history of this channel so I can answer questions about it. This may take a moment...",
         channel=channel_id
     )
 
-    # Run indexing in background thread (non-blocking)
-    thread = threading.Thread(
-        target=_index_channel_background,
-        args=(client, channel_id, channel_name),
-        daemon=True
+    # Run indexing in the background (non-blocking); joins beyond INDEX_WORKERS queue up
+    _index_pool.submit(
+        _index_channel_background, client, channel_id, channel_name, status_ts=response["ts"]
     )
-    thread.start()
 
 
 def start_socket_mode():
@@ -265,6 +427,12 @@ def start_socket_mode():
             "Please set SLACK_APP_TOKEN or SOCKET_MODE_TOKEN in your .env file."
         )
 
+    # Resolve the bot user ID now rather than on the first member_joined_channel event
+    get_bot_user_id(app.client)
+
     handler = SocketModeHandler(app, socket_token)
     print("⚡️ Slack RAG bot is running in Socket Mode!")
-    handler.start()
+    try:
+        handler.start()
+    finally:
+        _shutdown_pools()
@@ -0,0 +1,34 @@
+"""Shared OpenAI client."""
+
+from functools import lru_cache
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+from app.settings import settings
+
+# Keep idle connections open between bursts of embedding and chat calls, so
+# sporadic questions don't pay a fresh TCP/TLS handshake (httpx default: 5s)
+OPENAI_KEEPALIVE_EXPIRY = 120.0
+OPENAI_MAX_CONNECTIONS = 50
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """
+    Get the process-wide OpenAI client (built once).
+
+    The client is thread-safe; embeddings and answer generation share its
+    connection pool instead of each keeping their own.
+
+    Returns:
+        OpenAI client authenticated with the API key
+    """
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+        )
+    )
+    return OpenAI(api_key=settings.openai_api_key, http_client=http_client)
@@ -0,0 +1,21 @@
+"""Shared Slack WebClient."""
+
+from functools import lru_cache
+
+from slack_sdk import WebClient
+
+from app.settings import settings
+
+
+@lru_cache(maxsize=1)
+def get_slack_client() -> WebClient:
+    """
+    Get the process-wide Slack WebClient (built once).
+
+    WebClient is thread-safe, so the Bolt app, startup indexing and worker
+    threads all share this instance instead of constructing their own.
+
+    Returns:
+        WebClient authenticated with the bot token
+    """
+    return WebClient(token=settings.slack_bot_token, timeout=30)
@@ -1,20 +1,86 @@
 """Utilities for working with Slack permalinks."""
 
+import time
+from functools import lru_cache
+
 from slack_sdk import WebClient
 
 
-def get_permalink(client: WebClient, channel: str, message_ts: str) -> str | None:
+# Seconds after a failed auth.test before the workspace URL is looked up again
+# (until then permalinks come from chat.getPermalink)
+WORKSPACE_URL_RETRY_INTERVAL = 60.0
+
+# Per client: time.monotonic() before which a failed lookup isn't retried
+_workspace_url_retry_at: dict[WebClient, float] = {}
+
+
+@lru_cache(maxsize=8)
+def _lookup_workspace_url(client: WebClient) -> str:
+    """Call auth.test for the workspace URL (successes are cached per client)."""
+    return client.auth_test()["url"]
+
+
+def _workspace_url(client: WebClient) -> str | None:
+    """
+    Get the workspace URL (e.g. https://myteam.slack.com/), or None if auth.test failed.
+
+    A failure is remembered for WORKSPACE_URL_RETRY_INTERVAL seconds, so callers
+    go straight to the chat.getPermalink fallback instead of retrying auth.test
+    per message, while a transient error doesn't disable local permalinks for good.
+    """
+    if time.monotonic() < _workspace_url_retry_at.get(client, 0.0):
+        return None
+    try:
+        return _lookup_workspace_url(client)
+    except Exception as e:
+        print(f"Error getting workspace URL, falling back to chat.getPermalink: {e}")
+        _workspace_url_retry_at[client] = time.monotonic() + WORKSPACE_URL_RETRY_INTERVAL
+        return None
+
+
+def build_permalink(
+    workspace_url: str, channel: str, message_ts: str, thread_ts: str | None = None
+) -> str:
+    """
+    Build a message permalink without calling the Slack API.
+
+    Args:
+        workspace_url: Workspace URL from auth.test (e.g. https://myteam.slack.com/)
+        channel: Channel ID
+        message_ts: Message timestamp
+        thread_ts: Parent message timestamp, for thread replies
+
+    Returns:
+        Permalink URL in the format returned by chat.getPermalink
+    """
+    url = f"{workspace_url.rstrip('/')}/archives/{channel}/p{message_ts.replace('.', '')}"
+    if thread_ts and thread_ts != message_ts:
+        url += f"?thread_ts={thread_ts}&cid={channel}"
+    return url
+
+
+def get_permalink(
+    client: WebClient, channel: str, message_ts: str, thread_ts: str | None = None
+) -> str | None:
     """
     Get a permalink for a Slack message.
 
+    The permalink is built locally from the workspace URL (one auth.test call
+    per client); chat.getPermalink is only used while that lookup is failing.
+
     Args:
         client: Slack WebClient instance
         channel: Channel ID
         message_ts: Message timestamp
+        thread_ts: Parent message timestamp, for thread replies
 
     Returns:
         Permalink URL or None if request fails
     """
+    workspace_url = _workspace_url(client)
+    if workspace_url:
+        return build_permalink(workspace_url, channel, message_ts, thread_ts)
+
     try:
         response = client.chat_getPermalink(channel=channel, message_ts=message_ts)
         if response["ok"]: